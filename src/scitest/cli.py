@@ -24,6 +24,7 @@ PARSER_FIELDS = (
     "cmp_ver",
     "out_ver",
     "test_suites",
+    "parallelism",
 )
 
 
@@ -101,6 +102,16 @@ def _make_argument_parser() -> ArgumentParser:
         help="Name of test suite to run.",
     )
 
+    # How to run tests
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        dest="parallelism",
+        metavar="N",
+        help="Number of tests to run at once.",
+    )
+
     # Directories for output
     parser.add_argument(
         "--test-out-dir",
@@ -105,6 +105,7 @@ class TestConfig:
         cmp_ver: compare this version against the reference
         out_ver: use this version to stamp the test output
         test_suites: run only these test suites
+        parallelism: number of tests to run at once. Default is to run serially
     """
 
     test_dirs: Optional[set[Path]] = _path_set_field()
@@ -117,6 +118,11 @@ class TestConfig:
     cmp_ver: Optional[str] = _version_field()
     out_ver: Optional[str] = _version_field()
     test_suites: Optional[set[str]] = _test_suite_set_field()
+    parallelism: Optional[int] = attrs.field(
+        default=None,
+        converter=attrs.converters.optional(int),
+        validator=attrs.validators.optional(attrs.validators.ge(1)),
+    )
 
     @staticmethod
     def _pprint_value(attrib: attrs.Attribute, value: Any, indent: int) -> str:
@@ -7,30 +7,6 @@ from scitest.exceptions import QueryError, TestCodeError
 from scitest.query import OutputQueryBase, QueryResult
 
 
-class _PushDir:
-    """Context manager to move execution into a new directory.
-
-    Todo: part of std library as of 3.11
-    """
-
-    def __init__(self, target):
-        # type: (Path) -> None
-        self.target_dir = target
-
-    def __enter__(self):
-        # type: () -> None
-        import os
-
-        self.old_dir = Path.cwd()
-        os.chdir(self.target_dir)
-
-    def __exit__(self, exc_type, exc_value, traceback):
-        # type: (Any, Any, Any) -> None
-        import os
-
-        os.chdir(self.old_dir)
-
-
 class ExeTestFixture:
     """Test fixture handles setting up and running the program under test.
 
@@ -126,11 +102,12 @@ class ExeTestFixture:
             raise RuntimeError("Test fixture is not set up.")
 
         # Run the program
+        # Run in the scratch directory without changing the process cwd, so several
+        # fixtures may run at once
         _args = [str(self.exe_path), *self.exe_args]
-        with _PushDir(self.scratch_dir):
-            _pout = subprocess.run(
-                _args, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
+        _pout = subprocess.run(
+            _args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, cwd=self.scratch_dir
+        )
 
         if _pout.returncode != 0:
             raise TestCodeError(
@@ -43,6 +43,10 @@ from scitest.suite import (
 
 _T = TypeVar("_T")
 
+# Use the libyaml bindings when PyYAML was built with them
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 
 def _exclusive_merge(_d1: Mapping[str, _T], _d2: Mapping[str, _T]) -> Mapping[str, _T]:
     """Merge two dicts, raising an error if they share a key."""
@@ -60,7 +64,7 @@ def _load_serialized_file(file_path: Path) -> Any:
 
     if file_type in (".yml", ".yaml"):
         try:
-            parsed = yaml.safe_load(file_contents)
+            parsed = yaml.load(file_contents, Loader=_YamlLoader)
         except yaml.YAMLError as exe:
             raise SerializationError(
                 f"Could not parse file {file_path.name} as yaml"
@@ -84,7 +88,7 @@ def _write_serialized_file(file_path: Path, file_data: Any) -> None:
 
     if file_type in (".yml", ".yaml"):
         try:
-            serialized = yaml.safe_dump(file_data)
+            serialized = yaml.dump(file_data, Dumper=_YamlDumper)
         except yaml.YAMLError as exe:
             raise SerializationError(
                 f"Could not serialize {file_path.name} as yaml"
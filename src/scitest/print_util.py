@@ -1,6 +1,9 @@
 """Basic utilities for formatting output text."""
 
+import io
 import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
 from typing import Sequence, TextIO, Tuple
 
 
@@ -44,6 +47,20 @@ def wrap_line(line, max_length=80, indent=4, sep=" "):
         return "\n".join(line_buffer) + "\n"
 
 
+@contextmanager
+def buffered_output(out_stream: TextIO) -> Iterator[TextIO]:
+    """Collect output in memory and pass it on to `out_stream` in a single write.
+
+    Output collected before an error is still written.
+    """
+    buffer = io.StringIO()
+    try:
+        yield buffer
+    finally:
+        out_stream.write(buffer.getvalue())
+        out_stream.flush()
+
+
 class OutputTable:
     """Write a table of data onto and output stream.
 
@@ -93,11 +110,9 @@ class OutputTable:
         Raises:
             ValueError: If `values` is incorrectly sized for the table
         """
-        self.out_stream.write("|")
         assert len(values) == len(self.fields)
         entries = [self._format_entry(v, w) for v, w in zip(values, self.field_widths)]
-        self.out_stream.write("|".join(entries))
-        self.out_stream.write("|\n")
+        self.out_stream.write("|" + "|".join(entries) + "|\n")
 
     def write_footer(self):
         # type: () -> None
@@ -2,6 +2,7 @@
 
 import enum
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from pathlib import Path
 from typing import Any, Callable, Generic, Iterable, Type, TypeVar
 
@@ -285,15 +286,24 @@ def load_query(state: SerializedType) -> OutputQueryBase:
 _query_map: dict[str, OutputQueryBase] = {}
 
 
-def register_queries(queries: Iterable[OutputQueryBase]) -> None:
+def register_queries(
+    queries: Iterable[OutputQueryBase] | Mapping[str, OutputQueryBase],
+) -> None:
     """Register queries with the query resolver.
 
     Args:
-        queries: Query objects to register
+        queries: Query objects to register, or a mapping of query names to query
+            objects. A mapping is inserted into the resolver in a single update.
 
     Raises:
         RuntimeError: If a duplicate query name is registered
     """
+    if isinstance(queries, Mapping):
+        duplicates = _query_map.keys() & queries.keys()
+        if duplicates:
+            raise RuntimeError(f"Duplicate query {min(duplicates)!r} registered.")
+        _query_map.update(queries)
+        return
     for query in queries:
         q_name = query.query_name
         if q_name in _query_map:
@@ -313,6 +323,7 @@ def resolve_query(query_name: str) -> OutputQueryBase:
     Raises:
         KeyError: If the query is not found
     """
-    if query_name not in _query_map:
+    query = _query_map.get(query_name)
+    if query is None:
         raise KeyError(f"Query {query_name!r} not known.")
-    return _query_map[query_name]
+    return query
@@ -49,17 +49,15 @@ def _dereference_query_map(
     concrete_schema = OutputQueryBase.get_object_schema(strict=False)
     extended_schema = schema.Schema({"query-name": str, "extends": str, "with": dict})
 
-    unprocessed_queries = dict(init_map)  # Queries that still need to be dereferenced
+    unprocessed_queries: dict[str, _QueryDefT] = {}  # Queries to be dereferenced
     final_queries: dict[str, _QueryDefT] = {}  # Concrete query definitions
 
-    # Search initial map and extract concrete definitions
-    # Iterate over a static list of keys to enable deletion of keys during iteration
-    for query_name in list(unprocessed_queries):
-        query_def = unprocessed_queries[query_name]
+    # Search initial map and sort concrete definitions from referential ones
+    for query_name, query_def in init_map.items():
         if concrete_schema.is_valid(query_def):
-            # Concrete definition; move to output map
             final_queries[query_name] = query_def
-            del unprocessed_queries[query_name]
+        else:
+            unprocessed_queries[query_name] = query_def
 
     # noinspection PyTypeChecker
     def _update_mapping(obj: _QueryDefT, to_update: Mapping[str, Any]) -> None:
@@ -78,10 +76,10 @@ def _dereference_query_map(
 
     # Try to update referential query definitions
     while unprocessed_queries:
-        query_updated = False
+        # Queries whose base definition is not yet available; retried on the next pass
+        remaining_queries: dict[str, _QueryDefT] = {}
 
-        for query_name in list(unprocessed_queries):
-            query_def = unprocessed_queries[query_name]
+        for query_name, query_def in unprocessed_queries.items():
             # Match against the referential query definition
             if not extended_schema.is_valid(query_def):
                 raise SerializationError(f"Invalid query definition for {query_name}")
@@ -89,14 +87,15 @@ def _dereference_query_map(
             if query_def["extends"] in final_queries:
                 # Dereference query definition
                 final_queries[query_name] = dereference_query(query_def)
-                query_updated = True
-                del unprocessed_queries[query_name]
+            else:
+                remaining_queries[query_name] = query_def
 
-        if not query_updated:
+        if len(remaining_queries) == len(unprocessed_queries):
             raise SerializationError(
                 "Some query definitions could not be dereferenced."
                 f" Remaining queries: {unprocessed_queries.keys()}"
             )
+        unprocessed_queries = remaining_queries
 
     return final_queries
 
@@ -194,9 +193,9 @@ def load_query_file(
         raise SerializationError("Malformed query file") from exe
 
     query_map = parse_queries(parsed["queries"])
-    register_queries(query_map.values())
+    register_queries(query_map)
 
     query_set_map = parse_query_sets(parsed["query-sets"])
-    register_query_sets(query_set_map.values())
+    register_query_sets(query_set_map)
 
     return query_map, query_set_map
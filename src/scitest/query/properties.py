@@ -17,6 +17,9 @@ SerializedType: TypeAlias = int | float | None | str | Sequence | Mapping[str, A
 class Serializable(ABC):
     """Interface definition for a serializable object."""
 
+    # No instance state; allows slotted subclasses to omit the instance dict
+    __slots__ = ()
+
     @classmethod
     @abstractmethod
     def get_object_schema(cls, *, strict: bool = True) -> SchemaType:
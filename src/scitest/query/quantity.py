@@ -18,9 +18,24 @@ quantity: RegisteredType
 which is deserialized as `RegisteredType()`
 """
 
+import math
+import sys
 from abc import ABC, abstractmethod
-from operator import methodcaller
-from typing import Any, Callable, Generic, Mapping, Optional, Sequence, TypeVar
+from decimal import Decimal
+from functools import lru_cache, partial, wraps
+from itertools import accumulate
+from operator import eq, methodcaller, sub
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Sequence,
+    TypeVar,
+)
 
 import attrs
 import attrs.validators as attrsv
@@ -46,6 +61,8 @@ def register_quantity_type(cls: type["QuantityTypeBase"]) -> type["QuantityTypeB
     """
     if cls.__name__ not in _quantity_type_map:
         _quantity_type_map[cls.__name__] = cls
+    # Build the field table up front rather than on first (de)serialization
+    _get_field_plan(cls)
     return cls
 
 
@@ -64,10 +81,84 @@ def load_quantity(state: SerializedType) -> "QuantityTypeBase":
     return qty_cls.from_serialized(state)
 
 
+# Schema for the abbreviated serialization format, which is just the type name
+_ABBREVIATED_SCHEMA = schema.Schema(str)
+
 # Keys to supply additional metadata to the attrs fields
 QUANTITY_SCHEMA_KEY: str = "__quantity_schema"
 QUANTITY_SERIALIZER_KEY: str = "__quantity_serializer"
 QUANTITY_DESERIALIZE_KEY: str = "__quantity_deserialize"
+QUANTITY_EXCLUDE_KEY: str = "__quantity_exclude"
+
+
+def _private_field(**kwargs: Any) -> Any:
+    """Field for internal state which is not a parameter of the quantity."""
+    if "metadata" not in kwargs:
+        kwargs["metadata"] = {}
+    kwargs["metadata"].update({QUANTITY_EXCLUDE_KEY: True})
+    kwargs.update({"init": False, "eq": False, "repr": False})
+    return attrs.field(**kwargs)
+
+
+@attrs.frozen
+class _FieldPlan:
+    """Serialization details for a single field of a quantity class.
+
+    Attributes:
+        name: Attribute name of the field
+        alias: Name of the field in the class constructor
+        default: Default value, or `attrs.NOTHING` if the field has none
+        serializer: Function to encode the field value, if needed
+        deserializer: Function to decode the serialized field value, if needed
+    """
+
+    name: str
+    alias: str
+    default: Any
+    serializer: Optional[Callable[[Any], Any]]
+    deserializer: Optional[Callable[[Any], Any]]
+
+
+@lru_cache(maxsize=None)
+def _get_field_plan(cls: type["QuantityTypeBase"]) -> tuple[_FieldPlan, ...]:
+    """Collect the serialization details for each field of a quantity class."""
+    return tuple(
+        _FieldPlan(
+            name=field.name,
+            alias=field.alias,
+            default=field.default,
+            serializer=field.metadata.get(QUANTITY_SERIALIZER_KEY),
+            deserializer=field.metadata.get(QUANTITY_DESERIALIZE_KEY),
+        )
+        for field in attrs.fields(cls)
+        if not field.metadata.get(QUANTITY_EXCLUDE_KEY, False)
+    )
+
+
+def _wrap_validator(attr: attrs.Attribute) -> Callable[[Any], bool]:
+    """Convert an attrs validator into a predicate usable in a schema."""
+
+    @wraps(attr.validator)
+    def _wrapped(value: Any) -> bool:
+        try:
+            # Todo: this is a probable bug. Methods need to be explicitly passed
+            #   their instance attribute, but using a plain function as a validator
+            #   would break this
+            attr.validator(attr.validator, attr, value)
+        except Exception:
+            return False
+        return True
+
+    return _wrapped
+
+
+def _value_schema(attr: attrs.Attribute) -> Any:
+    """Choose the schema used to validate the serialized value of a field."""
+    if QUANTITY_SCHEMA_KEY in attr.metadata:
+        return attr.metadata[QUANTITY_SCHEMA_KEY]
+    if attr.validator is not None:
+        return _wrap_validator(attr)
+    return object
 
 
 @attrs.define(order=False)
@@ -116,38 +207,25 @@ class QuantityTypeBase(Serializable, Generic[_T], ABC):
         """Explain comparison of query results."""
         raise NotImplementedError
 
+    def compare_batch(self, ref: Iterable[_T], test: Iterable[_T]) -> Iterator[bool]:
+        """Compare paired query results elementwise.
+
+        Subclasses may override this to compare many values with less overhead than
+        repeated calls to `compare`.
+        """
+        return map(self.compare, ref, test)
+
     # ----------------------------------------------------------------
     # Methods relating to the underlying quantity class
     # ----------------------------------------------------------------
 
     @classmethod
+    @lru_cache(maxsize=None)
     def get_property_schema(cls, *, strict: bool = False) -> SchemaType:
-        """Return schema for the properties for this specific type."""
-
-        def _wrap_validator(attr: attrs.Attribute) -> Callable[[Any], bool]:
-            # pylint: disable=import-outside-toplevel
-            from functools import wraps
-
-            @wraps(attr.validator)
-            def _wrapped(value: Any) -> bool:
-                try:
-                    # Todo: this is a probable bug. Methods need to be explicitly passed
-                    #   their instance attribute, but using a plain function as a validator
-                    #   would break this
-                    attr.validator(attr.validator, attr, value)
-                except Exception:
-                    return False
-                return True
-
-            return _wrapped
-
-        def _value_schema(attr: attrs.Attribute) -> Any:
-            if QUANTITY_SCHEMA_KEY in attr.metadata:
-                return attr.metadata[QUANTITY_SCHEMA_KEY]
-            if attr.validator is not None:
-                return _wrap_validator(attr)
-            return object
+        """Return schema for the properties for this specific type.
 
+        Schemas are built once per class and reused for later calls.
+        """
         properties = {
             (
                 schema.Optional(attr.name)
@@ -155,12 +233,17 @@ class QuantityTypeBase(Serializable, Generic[_T], ABC):
                 else attr.name
             ): _value_schema(attr)
             for attr in attrs.fields(cls)
+            if not (
+                QUANTITY_EXCLUDE_KEY in attr.metadata
+                and attr.metadata[QUANTITY_EXCLUDE_KEY]
+            )
         }
         if not strict:
             properties[schema.Optional(str)] = object
         return schema.Schema(properties)
 
     @classmethod
+    @lru_cache(maxsize=None)
     def get_full_quantity_schema(cls, *, strict: bool = True) -> SchemaType:
         """Return the unabbreviated schema for the quantity class."""
         return schema.Schema(
@@ -171,36 +254,28 @@ class QuantityTypeBase(Serializable, Generic[_T], ABC):
         )
 
     @classmethod
+    @lru_cache(maxsize=None)
     def get_object_schema(cls, *, strict: bool = True) -> SchemaType:
         """Return a schema for the quantity class.
 
         Both full and abbreviated forms are acceptable.
         """
         return schema.Schema(
-            schema.Or(cls.get_full_quantity_schema(strict=strict), schema.Schema(str)),
+            schema.Or(cls.get_full_quantity_schema(strict=strict), _ABBREVIATED_SCHEMA),
             name="Quantity",
         )
 
     def serialize(self) -> SerializedType:
         """Encode quantity object according to the schema."""
-
-        def _is_modified(attr: attrs.Attribute, value: Any) -> bool:
-            """Check whether a properties value differs from the default."""
-            if attr.default is not attrs.NOTHING and attr.default == value:
-                return False
-            return True
-
-        def _serializer(inst: type, field: attrs.Attribute, value: Any) -> Any:
-            if inst is None:
-                # This occurs when serializer is called on collection or mapping elements
-                # rather than a class. Assume that such objects are well-behaved or can
-                # be caught at earlier levels of serialization
-                return value
-            if QUANTITY_SERIALIZER_KEY in field.metadata:
-                return field.metadata[QUANTITY_SERIALIZER_KEY](value)
-            return value
-
-        state = attrs.asdict(self, filter=_is_modified, value_serializer=_serializer)
+        state = {}
+        for plan in _get_field_plan(type(self)):
+            value = getattr(self, plan.name)
+            # Only record values which differ from the default
+            if plan.default is not attrs.NOTHING and plan.default == value:
+                continue
+            if plan.serializer is not None:
+                value = plan.serializer(value)
+            state[plan.name] = value
         if state:
             # Use standard quantity schema
             return {"quantity-type": self.__class__.__name__, "parameters": state}
@@ -209,22 +284,26 @@ class QuantityTypeBase(Serializable, Generic[_T], ABC):
 
     @classmethod
     def type_from_serialized(cls, serialized: SerializedType) -> str:
-        """Extract the quantity type from a serialized representation."""
+        """Extract the quantity type from a serialized representation.
+
+        Only the type field is checked; the full state is validated by the
+        `from_serialized` method of the resolved class.
+        """
         # Use abbreviated format
-        if schema.Schema(str).is_valid(serialized):
-            return str(serialized)
-        try:
-            # Use the full format
-            parsed = cls.get_object_schema().validate(serialized)
-        except schema.SchemaError as exe:
-            raise SerializationError from exe
-        return parsed["quantity-type"]
+        if isinstance(serialized, str):
+            return serialized
+        # Use the full format
+        if isinstance(serialized, Mapping) and isinstance(
+            serialized.get("quantity-type"), str
+        ):
+            return serialized["quantity-type"]
+        raise SerializationError("Malformed quantity definition")
 
     @classmethod
     def from_serialized(cls: type[_QtyT], state: SerializedType) -> _QtyT:
         """Construct a new object out of a serialized representation."""
         # Try using abbreviated schema
-        if schema.Schema(str).is_valid(state):
+        if isinstance(state, str):
             cls_name = state
             params = {}
         else:
@@ -243,10 +322,9 @@ class QuantityTypeBase(Serializable, Generic[_T], ABC):
                 f"Serialized state for {cls_name} passed to {cls.__name__} constructor"
             )
         # Check if any fields need further processing
-        for field in attrs.fields(cls):
-            if field.alias in params and QUANTITY_DESERIALIZE_KEY in field.metadata:
-                _decoder = field.metadata[QUANTITY_DESERIALIZE_KEY]
-                params[field.alias] = _decoder(params[field.alias])
+        for plan in _get_field_plan(cls):
+            if plan.deserializer is not None and plan.alias in params:
+                params[plan.alias] = plan.deserializer(params[plan.alias])
         # Construct the object
         return cls(**params)
 
@@ -267,8 +345,28 @@ class QuantityWrapper(QuantityTypeBase[_WT], Generic[_WT, _T], ABC):
         },
     )
 
+    # Bound methods of the wrapped quantity, looked up once rather than per element
+    _wrapped_str_short: Callable[..., str] = _private_field()
+    _wrapped_str_long: Callable[[_T], str] = _private_field()
+    _wrapped_repr: Callable[[_T], SerializedType] = _private_field()
+    _wrapped_deserialize: Callable[[SerializedType], _T] = _private_field()
+    _wrapped_compare: Callable[[_T, _T], bool] = _private_field()
+    _wrapped_compare_msg: Callable[[_T, _T], str] = _private_field()
+    _wrapped_compare_batch: Callable[..., Iterator[bool]] = _private_field()
+
+    def __attrs_post_init__(self) -> None:
+        wrapped = self.wrapped_quantity
+        self._wrapped_str_short = wrapped.str_short
+        self._wrapped_str_long = wrapped.str_long
+        self._wrapped_repr = wrapped.repr_quantity
+        self._wrapped_deserialize = wrapped.deserialize_quantity
+        self._wrapped_compare = wrapped.compare
+        self._wrapped_compare_msg = wrapped.compare_msg
+        self._wrapped_compare_batch = wrapped.compare_batch
+
 
 @register_quantity_type
+@attrs.define(order=False)
 class OptionalQuantity(QuantityWrapper[Optional[_T], _T], Generic[_T]):
     """Wrapper for quantities that may contain a null value."""
 
@@ -278,32 +376,32 @@ class OptionalQuantity(QuantityWrapper[Optional[_T], _T], Generic[_T]):
             max_width = self.width
         if value is None:
             return "-" * min(max_width, 4)
-        return self.wrapped_quantity.str_short(value, max_width)
+        return self._wrapped_str_short(value, max_width)
 
     def str_long(self, value: Optional[_T]) -> str:
         """Represent value as a string."""
         if value is None:
             return "null"
-        return self.wrapped_quantity.str_long(value)
+        return self._wrapped_str_long(value)
 
     def repr_quantity(self, value: Optional[_T]) -> SerializedType:
         """Encode null values before passing to wrapped repr."""
         if value is None:
             # None should be a serializable type
             return None
-        return self.wrapped_quantity.repr_quantity(value)
+        return self._wrapped_repr(value)
 
     def deserialize_quantity(self, state: SerializedType) -> Optional[_T]:
         """Try to construct a null value before passing to the wrapped constructor."""
         if state is None:
             return None
-        return self.wrapped_quantity.deserialize_quantity(state)
+        return self._wrapped_deserialize(state)
 
     def compare(self, ref: Optional[_T], test: Optional[_T]) -> bool:
         """Check for null values before passing to wrapped compare."""
         if ref is None or test is None:
             return ref is None and test is None
-        return self.wrapped_quantity.compare(ref, test)
+        return self._wrapped_compare(ref, test)
 
     def compare_msg(self, ref: Optional[_T], test: Optional[_T]) -> str:
         """Note comparisons containing null values."""
@@ -314,7 +412,7 @@ class OptionalQuantity(QuantityWrapper[Optional[_T], _T], Generic[_T]):
                 return f"Expected null value, got {test!r}"
             if test is None:
                 return f"Expected {ref!r}, got null value"
-        return self.wrapped_quantity.compare_msg(ref, test)
+        return self._wrapped_compare_msg(ref, test)
 
 
 @register_quantity_type
@@ -338,6 +436,12 @@ class BoolQuantity(QuantityTypeBase[bool]):
         """Compare truth values directly."""
         return ref == test
 
+    def compare_batch(
+        self, ref: Iterable[bool], test: Iterable[bool]
+    ) -> Iterator[bool]:
+        """Compare paired truth values without calling `compare` per element."""
+        return map(eq, ref, test)
+
     def compare_msg(self, ref: bool, test: bool) -> str:
         """Print expected values if inconsistent."""
         if self.compare(ref, test):
@@ -395,6 +499,12 @@ class IntegerQuantity(QuantityTypeBase[int]):
             return False
         return True
 
+    def compare_batch(self, ref: Iterable[int], test: Iterable[int]) -> Iterator[bool]:
+        """Compare paired integers; exact comparisons skip `compare` entirely."""
+        if self.rel_tol is None and self.abs_tol is None:
+            return map(eq, ref, test)
+        return map(self.compare, ref, test)
+
     def compare_msg(self, ref: int, test: int) -> str:
         """Print the absolute error."""
         if self.compare(ref, test):
@@ -402,6 +512,124 @@ class IntegerQuantity(QuantityTypeBase[int]):
         return f"Abs. error = {ref - test:d}"
 
 
+def _scale_pow10(number: float, exp: int) -> float:
+    """Multiply by ``10 ** exp``, dividing when the power is not exact."""
+    if exp >= 0:
+        return number * 10.0**exp
+    return number / 10.0**-exp
+
+
+def _float_decimal_split(number: float) -> tuple[float, int]:
+    """Compute the mantissa and exponent of the float in base 10.
+
+    Returns:
+        Mantissa *m* and exponent *e* such that::
+            number = m * (10 ** e)
+    """
+    if number == 0:
+        return number, 0
+    if abs(number) < sys.float_info.min:
+        # Powers of ten are inexact for subnormals; use decimal arithmetic
+        _, digits, _exp = Decimal(number).as_tuple()
+        exponent = len(digits) + _exp - 1
+        return float(Decimal(number).scaleb(-exponent)), exponent
+    exponent = math.floor(math.log10(abs(number)))
+    mantissa = _scale_pow10(number, -exponent)
+    # Correct for rounding in the logarithm
+    if abs(mantissa) >= 10.0:
+        exponent += 1
+        mantissa = _scale_pow10(number, -exponent)
+    elif abs(mantissa) < 1.0:
+        exponent -= 1
+        mantissa = _scale_pow10(number, -exponent)
+    return mantissa, exponent
+
+
+def _decimal_widths(exponent: int) -> tuple[int, int]:
+    """Widths needed to show the scale of a number with the given base 10 exponent.
+
+    Returns:
+        Width of the trailing 'eNN' string in exponential form, and the minimum width
+        of the number in positional form (e.g. 12 -> 2, 1 -> 1, 0.001 -> 5)
+    """
+    if exponent >= 0:
+        return 1 + len(str(exponent)), 1 + exponent
+    return 2 + len(str(-exponent)), 2 - exponent
+
+
+def _format_fixed_float(
+    value: float,
+    width: int,
+    units_width: int,
+    *,
+    precision: Optional[int],
+    signed: bool,
+    zero_pad: bool,
+    widen_on_carry: bool = True,
+) -> str:
+    """Format a float in positional notation to exactly fill `width` characters.
+
+    Args:
+        value: Number to format
+        width: Exact length of the formatted string
+        units_width: Number of characters needed left of the decimal point, not
+            counting the sign
+        precision: Number of digits after the decimal point; fills the width if unset
+        signed: Always reserve a leading character for the sign
+        zero_pad: pad with leading zeros to exactly fill width
+        widen_on_carry: Allow another leading digit if rounding carries into one.
+            Otherwise the result is one character too long in that case.
+    """
+    sign_char = " " if signed else "-"
+    full_units_width = units_width + 1 if signed or value < 0 else units_width
+    if width < full_units_width:
+        raise ValueError("Width too small to accurately represent value")
+    if width == full_units_width:
+        # No space for decimals
+        if precision is not None and precision != 0:
+            raise ValueError("Width too small for desired precision")
+        formatted = f"{value:{sign_char}.0f}"
+    else:
+        max_precision = width - full_units_width - 1
+        tgt_precision = precision if precision is not None else max_precision
+        if max_precision < tgt_precision:
+            raise ValueError("Width too small for desired precision")
+        pad_char = "0" if zero_pad else ""
+        formatted = f"{value:{sign_char}#{pad_char}{width}.{tgt_precision}f}"
+    if widen_on_carry and len(formatted) > width:
+        # Rounding carried into a new leading digit
+        return _format_fixed_float(
+            value,
+            width,
+            units_width + 1,
+            precision=precision,
+            signed=signed,
+            zero_pad=zero_pad,
+        )
+    return formatted
+
+
+def _format_exp_form(
+    mantissa: float, exponent: int, width: int, format_float: Callable[..., str]
+) -> str:
+    """Format a number in exponential form to exactly fill `width` characters."""
+    exp_suffix_width, _ = _decimal_widths(exponent)
+    fmt_man = format_float(mantissa, width - exp_suffix_width, 1, widen_on_carry=False)
+    if abs(float(fmt_man)) >= 10.0:
+        # The mantissa rounded up to 10; carry into the exponent
+        return _format_exp_form(mantissa / 10.0, exponent + 1, width, format_float)
+    return f"{fmt_man:s}e{exponent:d}"
+
+
+def _refresh_long_fmt(
+    inst: "FloatQuantity", attrib: "attrs.Attribute[int]", value: int
+) -> int:
+    """Setter to keep the long format spec in sync with the precision."""
+    # pylint: disable=unused-argument
+    inst._long_fmt = f"#.{value}f"
+    return value
+
+
 @register_quantity_type
 @attrs.define(order=False)
 class FloatQuantity(QuantityTypeBase[float]):
@@ -427,6 +655,7 @@ class FloatQuantity(QuantityTypeBase[float]):
         default=6,
         kw_only=True,
         validator=(attrsv.instance_of(int), attrsv.ge(0)),
+        on_setattr=attrs.setters.pipe(attrs.setters.validate, _refresh_long_fmt),
     )
     signed: bool = attrs.field(
         default=False, kw_only=True, validator=attrsv.instance_of(bool)
@@ -438,6 +667,11 @@ class FloatQuantity(QuantityTypeBase[float]):
         default=False, kw_only=True, validator=attrsv.instance_of(bool)
     )
 
+    # Format spec for the long representation; refreshed when the precision is set
+    _long_fmt: str = _private_field(
+        default=attrs.Factory(lambda self: f"#.{self.precision}f", takes_self=True)
+    )
+
     @staticmethod
     def as_fixed_precision(value: float, precision: int) -> str:
         """Format ``value`` as a float with ``precision`` digits after the decimal."""
@@ -474,64 +708,18 @@ class FloatQuantity(QuantityTypeBase[float]):
             ValueError: If the value cannot be accurately represented in fewer than
                 `width` characters
         """
-        # pylint: disable=import-outside-toplevel
-        from decimal import Decimal
-
-        def _float_decimal_exp(number: float) -> int:
-            """Compute the decimal part of the float in base 10.
-
-            Returns:
-                Exponent *e* such that::
-                    number = m * (10 ** e)
-
-            Refs:
-                https://stackoverflow.com/a/45359185
-            """
-            (_, digits, _exp) = Decimal(number).as_tuple()
-            return len(digits) + _exp - 1
-
-        def _float_decimal_man(number: float) -> Decimal:
-            """Compute the mantissa of the float in base 10.
-
-            Returns:
-                Mantissa *m* such that::
-                    number = m * (10 ** e)
-            """
-            return Decimal(number).scaleb(-_float_decimal_exp(number)).normalize()
 
         if precision is not None and precision < 0:
             raise ValueError("Negative precision")
         if width < 1:
             raise ValueError("Width too small")
-        mantissa = float(_float_decimal_man(value))
-        exponent = _float_decimal_exp(value)
-
-        # Width for the trailing 'eNN' string
-        exp_suffix_width = 2 + _float_decimal_exp(exponent)
-        if exponent < 0:
-            exp_suffix_width += 1
-
-        # Minimum width for a float number to give the correct "scale"
-        # E.g. 12 -> 2, 1 -> 1, 0.001 -> 5
-        if exponent >= 0:
-            min_float_width = 1 + exponent
-        else:
-            min_float_width = 2 + abs(exponent)
-
-        def _format_float(_value: float, _width: int, _units_width: int) -> str:
-            sign_char = " " if signed else "-"
-            if signed or _value < 0:
-                _units_width += 1
-            if _width == _units_width:
-                # No space for decimals
-                if precision is not None and precision != 0:
-                    raise ValueError("Width too small for desired precision")
-                return f"{_value:{sign_char}.0f}"
-            max_precision = _width - _units_width - 1
-            tgt_precision = precision if precision is not None else max_precision
-            if max_precision < tgt_precision:
-                raise ValueError("Width too small for desired precision")
-            return f"{_value:{sign_char}#{'0' if zero_pad else ''}{_width}.{tgt_precision}f}"
+        if not math.isfinite(value):
+            raise ValueError("Cannot represent non-finite value in fixed width")
+        mantissa, exponent = _float_decimal_split(value)
+        exp_suffix_width, min_float_width = _decimal_widths(exponent)
+        _format_float = partial(
+            _format_fixed_float, precision=precision, signed=signed, zero_pad=zero_pad
+        )
 
         # Choose between float or exp form by whichever allows more significant digits
         if 1 + exp_suffix_width < min_float_width and allow_exp:
@@ -542,8 +730,7 @@ class FloatQuantity(QuantityTypeBase[float]):
                     # Print as rounded zero
                     return _format_float(0.0, width, 1)
                 raise ValueError("Width to small to accurately represent value")
-            fmt_man = _format_float(mantissa, width - exp_suffix_width, 1)
-            return f"{fmt_man:s}e{exponent:d}"
+            return _format_exp_form(mantissa, exponent, width, _format_float)
         else:
             # Format as float
             if exponent < 0:
@@ -551,10 +738,18 @@ class FloatQuantity(QuantityTypeBase[float]):
                 return _format_float(value, width, 1)
             if width < min_float_width:
                 raise ValueError("Width too small to accurately represent value")
-            return _format_float(value, width, min_float_width)
+            try:
+                return _format_float(value, width, min_float_width)
+            except ValueError:
+                if not allow_exp:
+                    raise
+                # Rounding carried into a digit that does not fit; try the exp form
+                return _format_exp_form(mantissa, exponent, width, _format_float)
 
     def str_short(self, value: float, max_width: Optional[int] = None) -> str:
         """Format float to fit in the desired width."""
+        # Unlike the long form, there is no fixed spec to precompute: the layout depends
+        # on the magnitude of each value and on the width requested by the caller
         if max_width is None:
             max_width = self.width
         return self.as_fixed_width(
@@ -568,7 +763,7 @@ class FloatQuantity(QuantityTypeBase[float]):
 
     def str_long(self, value: float) -> str:
         """Format float with the desired precision."""
-        return self.as_fixed_precision(value, self.precision)
+        return format(value, self._long_fmt)
 
     def compare(self, ref: float, test: float) -> bool:
         """Compare floats, considering both absolute and relative tolerance.
@@ -580,9 +775,21 @@ class FloatQuantity(QuantityTypeBase[float]):
         tol = self.abs_tol + self.rel_tol * abs(ref)
         return abs(ref - test) <= tol
 
+    def compare_batch(
+        self, ref: Iterable[float], test: Iterable[float]
+    ) -> Iterator[bool]:
+        """Compare paired floats with the tolerances looked up only once."""
+        abs_tol = self.abs_tol
+        rel_tol = self.rel_tol
+        if rel_tol == 0.0 and math.isfinite(abs_tol):
+            # Constant tolerance: chain builtins so no bytecode runs per element. An
+            # infinite tolerance is excluded, as `compare` gives nan for infinite refs.
+            return map(abs_tol.__ge__, map(abs, map(sub, ref, test)))
+        return (abs(r - t) <= abs_tol + rel_tol * abs(r) for r, t in zip(ref, test))
+
     def compare_msg(self, ref: float, test: float) -> str:
         """Display the error between two numeric results."""
-        return f"Abs. error {self.as_fixed_precision(test - ref, self.precision)}"
+        return f"Abs. error {format(test - ref, self._long_fmt)}"
 
 
 def _print_sequence(
@@ -601,13 +808,16 @@ def _print_sequence(
 
     if not split_each_line:
         # Put as many items as possible on each line
+        # Prefix sums give the total length of any run of items in constant time
+        length_sums = (0, *accumulate(item_lengths))
         lines = []
         line_start = 0
         n_items = 0
         while line_start + n_items <= len(values):
             line_len = (
                 indent
-                + sum(item_lengths[line_start : line_start + n_items])
+                + length_sums[line_start + n_items]
+                - length_sums[line_start]
                 + 2 * n_items
             )
             if line_len > max_line_length:
@@ -627,6 +837,7 @@ def _print_sequence(
 
 
 @register_quantity_type
+@attrs.define(order=False)
 class SequenceQuantity(QuantityWrapper[Sequence[_T], _T]):
     """Formatting and comparison for sequences of values."""
 
@@ -641,39 +852,36 @@ class SequenceQuantity(QuantityWrapper[Sequence[_T], _T]):
 
     def str_long(self, value: Sequence[_T]) -> str:
         """Print all elements of the sequence verbosely."""
-        return _print_sequence([self.wrapped_quantity.str_long(el) for el in value])
+        return _print_sequence(list(map(self._wrapped_str_long, value)))
 
     def repr_quantity(self, value: Sequence[_T]) -> SerializedType:
         """Represent as a list and pass element representation to wrapped object."""
-        return [self.wrapped_quantity.repr_quantity(elem) for elem in value]
+        return list(map(self._wrapped_repr, value))
 
     def deserialize_quantity(self, state: SerializedType) -> Sequence[_T]:
         """Load sequence result iteratively from serialized."""
-        return [self.wrapped_quantity.deserialize_quantity(elem) for elem in state]
+        return list(map(self._wrapped_deserialize, state))
 
     def compare(self, ref: Sequence[_T], test: Sequence[_T]) -> bool:
         """Ensure that all sequence elements match."""
         if len(ref) != len(test):
             return False
-        return all(
-            self.wrapped_quantity.compare(ref_el, tst_el)
-            for ref_el, tst_el in zip(ref, test)
-        )
+        return all(self._wrapped_compare_batch(ref, test))
 
     def compare_msg(self, ref: Sequence[_T], test: Sequence[_T]) -> str:
         """Print count of non-matching elements."""
-        if self.compare(ref, test):
-            return "All elements match"
-        elif len(ref) != len(test):
+        if len(ref) != len(test):
             return "Sequence lengths differ"
-        else:
-            elem_errs = sum(
-                not self.wrapped_quantity.compare(e1, e2) for e1, e2 in zip(ref, test)
-            )
-            return f"Errors in {elem_errs:d} elements"
+        elem_errs = sum(
+            not is_match for is_match in self._wrapped_compare_batch(ref, test)
+        )
+        if elem_errs == 0:
+            return "All elements match"
+        return f"Errors in {elem_errs:d} elements"
 
 
 @register_quantity_type
+@attrs.define(order=False)
 class MappingQuantity(QuantityWrapper[Mapping[_KT, _T], _T]):
     """Formatting and comparison for mappings."""
 
@@ -688,39 +896,36 @@ class MappingQuantity(QuantityWrapper[Mapping[_KT, _T], _T]):
 
     def str_long(self, value: Mapping[_KT, _T]) -> str:
         """Print all elements of the mapping."""
+        str_long = self._wrapped_str_long
         return _print_sequence(
-            [f"{k!s}: {self.wrapped_quantity.str_long(v)}" for k, v in value.items()],
-            delim="{}",
+            [f"{k!s}: {str_long(v)}" for k, v in value.items()], delim="{}"
         )
 
     def repr_quantity(self, value: Mapping[_KT, _T]) -> SerializedType:
         """Represent mapping as dict and pass value representation to wrapped object."""
-        return {
-            str(k): self.wrapped_quantity.repr_quantity(v) for k, v in value.items()
-        }
+        repr_elem = self._wrapped_repr
+        return {str(k): repr_elem(v) for k, v in value.items()}
 
     def deserialize_quantity(self, state: SerializedType) -> Mapping[_KT, _T]:
         """Load mapping from representation."""
         # Note: Only support string-like keys
-        return {
-            str(k): self.wrapped_quantity.deserialize_quantity(v)
-            for k, v in state.items()
-        }
+        deserialize_elem = self._wrapped_deserialize
+        return {str(k): deserialize_elem(v) for k, v in state.items()}
 
     def compare(self, ref: Mapping[_KT, _T], test: Mapping[_KT, _T]) -> bool:
         """Ensure that all keys and values match."""
+        # Key views compare by length, then by membership; no sets are built
         if ref.keys() != test.keys():
             return False
-        return all(self.wrapped_quantity.compare(ref[k], test[k]) for k in ref)
+        compare_elem = self._wrapped_compare
+        return all(compare_elem(v, test[k]) for k, v in ref.items())
 
     def compare_msg(self, ref: Mapping[_KT, _T], test: Mapping[_KT, _T]) -> str:
         """Print count of non-matching elements."""
-        if self.compare(ref, test):
-            return "All elements match"
-        elif ref.keys() != test.keys():
+        if ref.keys() != test.keys():
             return "Different keys are present"
-        else:
-            elem_errs = sum(
-                not self.wrapped_quantity.compare(ref[k], test[k]) for k in ref
-            )
-            return f"Errors in {elem_errs:d} elements"
+        compare_elem = self._wrapped_compare
+        elem_errs = sum(not compare_elem(v, test[k]) for k, v in ref.items())
+        if elem_errs == 0:
+            return "All elements match"
+        return f"Errors in {elem_errs:d} elements"
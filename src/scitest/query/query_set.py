@@ -1,21 +1,49 @@
 """Datastructures for collections of queries and query results."""
 
-from collections.abc import Collection, Iterable, Iterator, Mapping
-from typing import Type, TypeVar
+import sys
+from collections.abc import (
+    Collection,
+    Hashable,
+    ItemsView,
+    Iterable,
+    Iterator,
+    Mapping,
+    ValuesView,
+)
+from functools import lru_cache
+from operator import attrgetter
+from typing import Type, TypeVar, cast
 
 import schema
 
 from scitest.exceptions import SerializationError, TestCodeError, TestFailure
 from scitest.query.base import OutputQueryBase, resolve_query
 from scitest.query.properties import SchemaType, Serializable, SerializedType
+from scitest.query.quantity import QuantityTypeBase
 from scitest.query.results import QueryResult
 
 _ClsT = TypeVar("_ClsT")
 
+# Keys allowed in serialized query sets and result sets
+_QUERY_SET_KEYS = frozenset(("query-set-name", "queries"))
+_RESULT_SET_KEYS = frozenset(("results-name", "query-set", "results"))
+
+
+def _duplicate_free(seq: Iterable[Hashable]) -> bool:
+    """Check that no element repeats, stopping at the first duplicate."""
+    seen = set()
+    for elem in seq:
+        if elem in seen:
+            return False
+        seen.add(elem)
+    return True
+
 
 class QuerySet(Collection[OutputQueryBase], Serializable):
     """Named collection of query objects."""
 
+    __slots__ = ("_query_set_name", "_queries", "_name_index", "_hash")
+
     def __init__(
         self, query_set_name: str, queries: Collection[OutputQueryBase]
     ) -> None:
@@ -25,8 +53,11 @@ class QuerySet(Collection[OutputQueryBase], Serializable):
             query_set_name: name of query set
             queries: collection of query instances
         """
-        self.query_set_name = query_set_name
-        self.queries = queries
+        self._query_set_name = query_set_name
+        self._queries = {q.query_name: q for q in queries}
+        # Position of each query; shared by all result sets from this query set
+        self._name_index = {name: i for i, name in enumerate(self._queries)}
+        self._hash: int | None = None
 
     def __str__(self) -> str:
         return self.query_set_name
@@ -36,36 +67,55 @@ class QuerySet(Collection[OutputQueryBase], Serializable):
         query_name_str = ", ".join(name for name in self.query_names)
         return f"QuerySet({self.query_set_name}, {{{query_name_str}}})"
 
+    @property
+    def query_set_name(self) -> str:
+        """Name of the query set; read-only, since it is part of the hash."""
+        return self._query_set_name
+
+    @property
+    def queries(self) -> Collection[OutputQueryBase]:
+        """Queries in the query set."""
+        return self._queries.values()
+
     @property
     def query_names(self) -> Collection[str]:
         """Names of queries in the query set."""
-        return [q.query_name for q in self.queries]
+        return self._queries.keys()
 
     def __contains__(self, elem: object) -> bool:
         """Check if a query is in the set using query object equality testing."""
         if not isinstance(elem, OutputQueryBase):
             return NotImplemented
-        return elem in self.queries
+        query = self._queries.get(elem.query_name)
+        return query is not None and query == elem
 
     def __iter__(self) -> Iterator[OutputQueryBase]:
         """Iterate over queries in the set."""
-        return iter(self.queries)
+        return iter(self._queries.values())
 
     def __len__(self) -> int:
         """Return the number of queries in the set."""
-        return len(self.queries)
+        return len(self._queries)
 
     def __eq__(self, other: object) -> bool:
         """Check equality of both query set name and contained queries."""
+        if self is other:
+            # Registered query sets are shared, so this is the common case
+            return True
         if not isinstance(other, QuerySet):
             return NotImplemented
         if self.query_set_name != other.query_set_name:
             return False
-        if len(self) != len(other):
-            return False
-        return all(el in other for el in self)
+        return self._queries == other._queries
+
+    def __hash__(self) -> int:
+        """Hash the query set name and the names of contained queries."""
+        if self._hash is None:
+            self._hash = hash((self.query_set_name, frozenset(self._queries)))
+        return self._hash
 
     @classmethod
+    @lru_cache(maxsize=None)
     def get_object_schema(cls, *, strict: bool = True) -> SchemaType:
         """Return schema for QuerySet.
 
@@ -78,10 +128,6 @@ class QuerySet(Collection[OutputQueryBase], Serializable):
                     - registered_name2
                     ...
         """
-
-        def _duplicate_free(_seq: list) -> bool:
-            return len(_seq) == len(set(_seq))
-
         return schema.Schema(
             {
                 "query-set-name": str,
@@ -91,12 +137,41 @@ class QuerySet(Collection[OutputQueryBase], Serializable):
 
     def serialize(self) -> SerializedType:
         """Encode the query set according to the schema."""
-        return {"query-set-name": self.query_set_name, "queries": self.query_names}
+        return {
+            "query-set-name": self.query_set_name,
+            "queries": list(self.query_names),
+        }
 
     @classmethod
-    def from_serialized(cls: Type[_ClsT], state: SerializedType) -> _ClsT:
-        """Construct a query set and resolve referenced queries."""
-        state = cls.get_object_schema().validate(state)
+    def from_serialized(
+        cls: Type[_ClsT], state: SerializedType, *, strict: bool = False
+    ) -> _ClsT:
+        """Construct a query set and resolve referenced queries.
+
+        By default the state is checked directly rather than through the object
+        schema; pass `strict` to validate against the full schema.
+
+        Raises:
+            SerializationError: If the state is malformed or references an
+                unknown query
+        """
+        if strict:
+            try:
+                state = cls.get_object_schema().validate(state)
+            except schema.SchemaError as exe:
+                raise SerializationError("Malformed query set definition") from exe
+        elif not (
+            isinstance(state, dict)
+            and state.keys() <= _QUERY_SET_KEYS
+            and isinstance(state.get("query-set-name"), str)
+            and isinstance(state.get("queries"), list)
+            and all(isinstance(name, str) for name in state["queries"])
+        ):
+            raise SerializationError("Malformed query set definition")
+        elif not _duplicate_free(state["queries"]):
+            raise SerializationError(
+                f"Duplicate queries in query set {state['query-set-name']!r}"
+            )
 
         queries = []
         for query_name in state["queries"]:
@@ -112,17 +187,28 @@ class QuerySet(Collection[OutputQueryBase], Serializable):
 _query_set_map: dict[str, QuerySet] = {}
 
 
-def register_query_sets(query_sets: Iterable[QuerySet]) -> None:
+def register_query_sets(
+    query_sets: Iterable[QuerySet] | Mapping[str, QuerySet],
+) -> None:
     """Register known query sets with the resolver.
 
     Args:
-        query_sets: Query sets to register
+        query_sets: Query sets to register, or a mapping of query set names to query
+            sets. A mapping is inserted into the resolver in a single update.
 
     Raises:
         RuntimeError: If a duplicate name is registered
     """
+    if isinstance(query_sets, Mapping):
+        duplicates = _query_set_map.keys() & query_sets.keys()
+        if duplicates:
+            raise RuntimeError(f"Duplicate query set {min(duplicates)!r} registered.")
+        _query_set_map.update(
+            (sys.intern(name), q_set) for name, q_set in query_sets.items()
+        )
+        return
     for q_set in query_sets:
-        name = str(q_set)
+        name = sys.intern(str(q_set))
         if name in _query_set_map:
             raise RuntimeError(f"Duplicate query set {name!r} registered.")
         _query_set_map[name] = q_set
@@ -140,9 +226,29 @@ def resolve_query_set(query_set_name: str) -> QuerySet:
     Raises:
         KeyError: If the query set is not found
     """
-    if query_set_name not in _query_set_map:
+    query_set = _query_set_map.get(query_set_name)
+    if query_set is None:
         raise KeyError(f"Query set {query_set_name!r} not known.")
-    return _query_set_map[query_set_name]
+    return query_set
+
+
+class _ResultsItemsView(ItemsView[str, QueryResult]):
+    """Items view that walks the stored results instead of looking up each key."""
+
+    _mapping: "QuerySetResults"
+
+    def __iter__(self) -> Iterator[tuple[str, QueryResult]]:
+        results = self._mapping
+        return zip(results.query_set.query_names, results._results_list)
+
+
+class _ResultsValuesView(ValuesView[QueryResult]):
+    """Values view that walks the stored results instead of looking up each key."""
+
+    _mapping: "QuerySetResults"
+
+    def __iter__(self) -> Iterator[QueryResult]:
+        return iter(self._mapping._results_list)
 
 
 class QuerySetResults(Mapping[str, QueryResult], Serializable):
@@ -152,8 +258,13 @@ class QuerySetResults(Mapping[str, QueryResult], Serializable):
         query_results_name: Tag for the set of results
         query_set: Query set that produced the results
         results: Query results from each tests
+
+    Iteration follows the order of queries in the query set, not the order in
+    which ``results`` were given.
     """
 
+    __slots__ = ("results_name", "query_set", "_results_list")
+
     def __init__(
         self,
         query_results_name: str,
@@ -162,34 +273,58 @@ class QuerySetResults(Mapping[str, QueryResult], Serializable):
     ) -> None:
         self.results_name = query_results_name
         self.query_set = query_set
-        self.results = {str(res.query): res for res in results}
-        if not (
-            all(k in query_set for k in self.results.keys())
-            and len(self.results) == len(query_set)
-        ):
+        # Results are stored in query set order and looked up through the query set
+        name_index = query_set._name_index
+        ordered: list[QueryResult | None] = [None] * len(name_index)
+        n_results = 0
+        for res in results:
+            idx = name_index.get(res._key)
+            if idx is None or ordered[idx] is not None:
+                raise TestCodeError("Query set and results do not match.")
+            ordered[idx] = res
+            n_results += 1
+        if n_results != len(ordered):
             raise TestCodeError("Query set and results do not match.")
+        # Every slot is filled once the count matches
+        self._results_list = tuple(cast(list[QueryResult], ordered))
 
     def __str__(self) -> str:
         return self.results_name
 
+    @property
+    def query_set_name(self) -> str:
+        """Name of the query set that produced the results."""
+        return self.query_set.query_set_name
+
+    @property
+    def results(self) -> Mapping[str, QueryResult]:
+        """Map from query name to result, in query set order."""
+        return dict(self.items())
+
     def __repr__(self) -> str:
         return (
-            f"QuerySetResults({str(self)}, <{str(self.query_set)}>, "
-            f"<{len(self.results)} results>)"
+            f"QuerySetResults({str(self)}, <{self.query_set_name}>, "
+            f"<{len(self)} results>)"
         )
 
     def __iter__(self) -> Iterator[str]:
-        return iter(self.results)
+        return iter(self.query_set.query_names)
 
     def __getitem__(self, item: str) -> QueryResult:
-        return self.results[item]
+        return self._results_list[self.query_set._name_index[item]]
 
     def __len__(self) -> int:
-        return len(self.results)
+        return len(self._results_list)
+
+    def items(self) -> ItemsView[str, QueryResult]:
+        return _ResultsItemsView(self)
+
+    def values(self) -> ValuesView[QueryResult]:
+        return _ResultsValuesView(self)
 
     def count_errors(self) -> int:
         """Count the number of failed queries."""
-        return sum(res.error for res in self.results.values())
+        return sum(map(attrgetter("error"), self._results_list))
 
     def count_failures(self, other: "QuerySetResults") -> int:
         """Count the comparison failures between two results.
@@ -203,11 +338,7 @@ class QuerySetResults(Mapping[str, QueryResult], Serializable):
         if self.query_set != other.query_set:
             raise TestCodeError("Results sets have incompatible queries.")
 
-        failures = 0
-        for query_name in self:
-            if self[query_name] != other[query_name]:
-                failures += 1
-        return failures
+        return self._count_failures_batched(other)
 
     def compare_results(
         self, other: "QuerySetResults", raise_failures: bool = False
@@ -227,17 +358,56 @@ class QuerySetResults(Mapping[str, QueryResult], Serializable):
         if self.query_set != other.query_set:
             raise TestCodeError("Results sets have incompatible queries.")
 
-        has_failures = False
+        if not raise_failures:
+            return self._count_failures_batched(other) == 0
 
-        for query_name in self:
-            if self[query_name] != other[query_name]:
-                has_failures = True
-                if raise_failures:
-                    raise TestFailure(self[query_name], other[query_name])
+        for res, other_res in self._paired_results(other):
+            if res != other_res:
+                raise TestFailure(res, other_res)
+        return True
 
-        return not has_failures
+    def _count_failures_batched(self, other: "QuerySetResults") -> int:
+        """Count failures, comparing the results of each quantity in one batch.
+
+        Result sets must already be checked for compatibility.
+        """
+        failures = 0
+        # Group by quantity instance; equal quantities usually share one instance
+        batches: dict[int, tuple[QuantityTypeBase, list, list]] = {}
+        for res, other_res in self._paired_results(other):
+            if res.error or other_res.error:
+                failures += 1
+                continue
+            quantity = res.quantity
+            batch = batches.get(id(quantity))
+            if batch is None:
+                batch = batches[id(quantity)] = (quantity, [], [])
+            batch[1].append(res.result)
+            batch[2].append(other_res.result)
+
+        for quantity, ref_values, test_values in batches.values():
+            failures += sum(
+                not match for match in quantity.compare_batch(ref_values, test_values)
+            )
+        return failures
+
+    def _paired_results(
+        self, other: "QuerySetResults"
+    ) -> Iterator[tuple[QueryResult, QueryResult]]:
+        """Pair up results of the same query from two compatible result sets."""
+        if self.query_set is other.query_set:
+            # Both are stored in the same order; skip the lookups
+            return zip(self._results_list, other._results_list, strict=True)
+        # Equal query sets, possibly ordered differently: map positions once
+        other_index = other.query_set._name_index
+        other_results = other._results_list
+        return (
+            (res, other_results[other_index[name]])
+            for name, res in zip(self.query_set.query_names, self._results_list)
+        )
 
     @classmethod
+    @lru_cache(maxsize=None)
     def get_object_schema(cls, *, strict: bool = True) -> SchemaType:
         """Return a schema for the QuerySetResults.
 
@@ -259,13 +429,36 @@ class QuerySetResults(Mapping[str, QueryResult], Serializable):
         """Serialize set of results according to object schema."""
         return {
             "results-name": str(self),
-            "query-set": str(self.query_set),
-            "results": [res.serialize() for res in self.results.values()],
+            "query-set": self.query_set_name,
+            "results": [res.serialize() for res in self._results_list],
         }
 
     @classmethod
-    def from_serialized(cls, state: SerializedType) -> "QuerySetResults":
-        """Construct a results set from serialized input."""
-        results = [QueryResult.from_serialized(res) for res in state["results"]]
+    def from_serialized(
+        cls, state: SerializedType, *, strict: bool = False
+    ) -> "QuerySetResults":
+        """Construct a results set from serialized input.
+
+        As for `QueryResult`, the state is checked directly unless `strict` is set,
+        in which case it is validated against the object schema.
+
+        Raises:
+            SerializationError: If the state is malformed
+        """
+        if strict:
+            try:
+                state = cls.get_object_schema().validate(state)
+            except schema.SchemaError as exe:
+                raise SerializationError("Malformed query set results") from exe
+        elif not (
+            isinstance(state, dict)
+            and state.keys() <= _RESULT_SET_KEYS
+            and isinstance(state.get("results-name"), str)
+            and isinstance(state.get("query-set"), str)
+            and isinstance(state.get("results"), list)
+        ):
+            raise SerializationError("Malformed query set results")
+        # Resolve the query set first so an unknown set fails before any results load
         query_set = resolve_query_set(state["query-set"])
-        return cls(str(state["results-name"]), query_set, results)
+        results = list(map(QueryResult.from_serialized, state["results"]))
+        return cls(state["results-name"], query_set, results)
@@ -1,13 +1,15 @@
 """Datastructure to store query output."""
 
 import enum
+from functools import lru_cache
 from typing import Generic, Optional, TypeVar
 
 import schema
 
-from scitest.exceptions import TestCodeError
+from scitest.exceptions import SerializationError, TestCodeError
 from scitest.query.base import OutputQueryBase, resolve_query
 from scitest.query.properties import SchemaType, Serializable, SerializedType
+from scitest.query.quantity import QuantityTypeBase
 
 _T = TypeVar("_T")
 
@@ -34,12 +36,14 @@ class _TestError(enum.Enum):
 # Placeholder for the result of errored tests
 ERROR = _TestError.ERROR
 
+_RESULT_KEYS = frozenset(("query-name", "result", "error"))
+
 
 class QueryResult(Serializable, Generic[_T]):
     """Stores the result of a query and a pointer to the query definition.
 
     Representation and equality tests are implemented with calls to
-    class methods of the query class.
+    class methods of the query class. Attributes are read-only.
 
     Attributes:
         query: Class of query that was executed
@@ -47,16 +51,46 @@ class QueryResult(Serializable, Generic[_T]):
         error: indicates whether the query encountered an error
     """
 
+    __slots__ = (
+        "_query",
+        "_key",
+        "_result",
+        "_quantity",
+        "_error",
+        "_repr",
+        "_str_long",
+    )
+
     def __init__(
         self, query: OutputQueryBase[_T], result: _T, error: bool = False
     ) -> None:
-        self.query = query
-        self.result = result
-        self.quantity = query.quantity
-        self.error = error
+        self._query = query
+        # Name under which the result is stored in a result set
+        self._key = str(query)
+        self._quantity = query.quantity
+        self._error = error
         # Discard value in the case of an error
-        if self.error:
-            self.result = ERROR
+        self._result = ERROR if error else result
+        # Formatted output is built on first use; results are not modified after
+        # construction, so it cannot go stale
+        self._repr: str | None = None
+        self._str_long: str | None = None
+
+    @property
+    def query(self) -> OutputQueryBase[_T]:
+        return self._query
+
+    @property
+    def result(self) -> _T:
+        return self._result
+
+    @property
+    def quantity(self) -> QuantityTypeBase[_T]:
+        return self._quantity
+
+    @property
+    def error(self) -> bool:
+        return self._error
 
     def __str__(self) -> str:
         return self.str_short()
@@ -69,23 +103,32 @@ class QueryResult(Serializable, Generic[_T]):
 
     def str_long(self) -> str:
         """Print the full result. Can be multiline."""
-        if self.error:
-            return str(self.result)
-        return self.quantity.str_long(self.result)
+        if self._str_long is None:
+            if self.error:
+                self._str_long = str(self.result)
+            else:
+                self._str_long = self.quantity.str_long(self.result)
+        return self._str_long
 
     def __repr__(self) -> str:
-        if self.error:
-            return f"{self.__class__.__name__}(query={self.query!r}, result=ERROR, error=True)"
-        res = self.quantity.repr_quantity(self.result)
-        return f"{self.__class__.__name__}(query={self.query!r}, result={res})"
+        if self._repr is None:
+            if self.error:
+                args = f"query={self.query!r}, result={self.result!r}, error=True"
+            else:
+                res = self.quantity.repr_quantity(self.result)
+                args = f"query={self.query!r}, result={res}"
+            self._repr = f"{self.__class__.__name__}({args})"
+        return self._repr
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, QueryResult):
             return NotImplemented
-        try:
-            return self.compare(other)
-        except TestCodeError:
+        # Same checks as `compare`, but incompatible queries are simply unequal
+        if self.query is not other.query and self.query != other.query:
+            return False
+        if self.error or other.error:
             return False
+        return self.quantity.compare(self.result, other.result)
 
     def compare(self, other: "QueryResult") -> bool:
         """Test if two query results are equal.
@@ -116,6 +159,7 @@ class QueryResult(Serializable, Generic[_T]):
         return self.quantity.compare_msg(self.result, other.result)
 
     @classmethod
+    @lru_cache(maxsize=None)
     def get_object_schema(cls, *, strict: bool = True) -> SchemaType:
         """Return a schema for the serialized result object.
 
@@ -136,7 +180,7 @@ class QueryResult(Serializable, Generic[_T]):
 
     def serialize(self) -> SerializedType:
         """Serialize the query result according to the schema."""
-        state = {"query-name": str(self.query)}
+        state = {"query-name": self._key}
         if self.error:
             state["result"] = repr(self.result)
             state["error"] = True
@@ -146,11 +190,33 @@ class QueryResult(Serializable, Generic[_T]):
         return state
 
     @classmethod
-    def from_serialized(cls, state: SerializedType) -> "QueryResult":
-        """Load result object from serialized state."""
-        state = cls.get_object_schema().validate(state)
-        query = resolve_query(str(state["query-name"]))
-        if "error" in state and state["error"]:
+    def from_serialized(
+        cls, state: SerializedType, *, strict: bool = False
+    ) -> "QueryResult":
+        """Load result object from serialized state.
+
+        Results are deserialized in bulk, so by default only the structure needed
+        to rebuild the result is checked. Pass `strict` to validate the state
+        against the full object schema.
+
+        Raises:
+            SerializationError: If the state is malformed
+        """
+        if strict:
+            try:
+                state = cls.get_object_schema().validate(state)
+            except schema.SchemaError as exe:
+                raise SerializationError("Malformed query result") from exe
+        elif not (
+            isinstance(state, dict)
+            and state.keys() <= _RESULT_KEYS
+            and isinstance(state.get("query-name"), str)
+            and "result" in state
+            and isinstance(state.get("error", False), bool)
+        ):
+            raise SerializationError("Malformed query result")
+        query = resolve_query(state["query-name"])
+        if state.get("error", False):
             # Note: we discard any value stored in "result" here
             return cls(query, ERROR, error=True)
         result = query.quantity.deserialize_quantity(state["result"])
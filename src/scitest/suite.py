@@ -3,7 +3,9 @@
 A test is a pairing of program input conditions and queries for the results.
 """
 
-from collections.abc import Mapping, Sequence
+import sys
+from collections.abc import Callable, Mapping, Sequence
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional, TypeVar
 
@@ -19,7 +21,55 @@ _T = TypeVar("_T")
 _ClsT = TypeVar("_ClsT", bound="TestCase")
 
 
-@attrs.frozen(order=False)
+def _is_str(value: Any) -> bool:
+    """Check for a string."""
+    return isinstance(value, str)
+
+
+def _is_str_list(value: Any) -> bool:
+    """Check for a list of strings."""
+    return isinstance(value, list) and all(isinstance(el, str) for el in value)
+
+
+def _is_cli_args(value: Any) -> bool:
+    """Check for a single argument string or a list of arguments."""
+    return isinstance(value, str) or _is_str_list(value)
+
+
+def _is_input_files(value: Any) -> bool:
+    """Check for a list of files or a non-empty map from destination to source file."""
+    if isinstance(value, dict):
+        return len(value) > 0 and all(
+            isinstance(k, str) and isinstance(v, str) for k, v in value.items()
+        )
+    return _is_str_list(value)
+
+
+# Fields of a serialized test definition, mapped to whether the field is required and
+# a check for its value. Both the object schema and the direct check are built from it.
+_TEST_FIELDS: dict[str, tuple[bool, Callable[[Any], bool]]] = {
+    "test-name": (True, _is_str),
+    "prefix": (False, _is_str),
+    "args": (True, _is_cli_args),
+    "base-dir": (False, _is_str),
+    "input": (True, _is_input_files),
+    "queries": (True, _is_str_list),
+}
+
+
+def _is_test_state(state: Any) -> bool:
+    """Check a test definition against the fields accepted by `TestCase`."""
+    return (
+        isinstance(state, dict)
+        and state.keys() <= _TEST_FIELDS.keys()
+        and all(
+            check(state[key]) if key in state else not required
+            for key, (required, check) in _TEST_FIELDS.items()
+        )
+    )
+
+
+@attrs.frozen(order=False, slots=True)
 class TestCase(Serializable):
     """A pairing of program input and queries for the output.
 
@@ -38,10 +88,17 @@ class TestCase(Serializable):
     base_dir: Optional[Path] = attrs.field(default=None, kw_only=True)
     prefix: str = attrs.field(kw_only=True)
 
+    # Base directory resolved once at construction; unset reads from the cwd
+    _input_dir: Optional[Path] = attrs.field(init=False, eq=False, repr=False)
+
     @prefix.default
     def _prefix_default(self) -> str:
         return self.name
 
+    @_input_dir.default
+    def _input_dir_default(self) -> Optional[Path]:
+        return None if self.base_dir is None else self.base_dir.resolve()
+
     def run_query_set(
         self, fixture: ExeTestFixture, query_set: QuerySet
     ) -> QuerySetResults:
@@ -54,19 +111,22 @@ class TestCase(Serializable):
 
     def get_input_file(self, in_path: str) -> str:
         """Read contents of an input file referenced in a test."""
-        base_dir = Path.cwd() if self.base_dir is None else self.base_dir
+        base_dir = Path.cwd() if self._input_dir is None else self._input_dir
         full_path = base_dir / in_path
         if not full_path.is_relative_to(base_dir):
             raise ValueError("In file must be relative to base directory")
-        with open(full_path, encoding="utf8") as src_file:
-            return src_file.read()
+        return full_path.read_text(encoding="utf8")
 
     def run_test(self, fixture: ExeTestFixture) -> list[QuerySetResults]:
         """Run the test using the provided test fixture."""
-        in_files = {
-            dest_path: self.get_input_file(src_path)
-            for dest_path, src_path in self.input_files.items()
-        }
+        in_files = (
+            {
+                dest_path: self.get_input_file(src_path)
+                for dest_path, src_path in self.input_files.items()
+            }
+            if self.input_files
+            else {}
+        )
         results = []
         try:
             # Initialize the fixture
@@ -82,26 +142,24 @@ class TestCase(Serializable):
         return results
 
     @classmethod
+    @lru_cache(maxsize=None)
     def get_object_schema(cls, *, strict: bool = True) -> SchemaType:
         """Return schema for test definition."""
         if not strict:
             return schema.Schema(dict)
         return schema.Schema(
             {
-                "test-name": str,
-                schema.Optional("prefix"): str,
-                "args": schema.Or(str, [str]),
-                schema.Optional("base-dir"): str,
-                "input": schema.Or([str], {str: str}),
-                "queries": [str],
+                key if required else schema.Optional(key): check
+                for key, (required, check) in _TEST_FIELDS.items()
             }
         )
 
-    def serialize(self) -> SerializedType:
+    def serialize(self, *, cwd: Optional[Path] = None) -> SerializedType:
         """Save the test definition to file.
 
         Note that the file is assumed to be saved in the cwd, so the base directory that
-        is searched for linked files is saved relative to the cwd.
+        is searched for linked files is saved relative to the cwd. Callers serializing
+        many tests may pass the cwd to avoid looking it up for each test.
         """
         state = {
             "test-name": self.name,
@@ -110,47 +168,68 @@ class TestCase(Serializable):
             "input": self.input_files,
             "queries": [_qset.query_set_name for _qset in self.query_sets],
         }
-        if self.base_dir is None or self.base_dir == Path.cwd():
+        if self.base_dir is None:
+            return state
+        if cwd is None:
+            cwd = Path.cwd()
+        if self.base_dir == cwd:
             return state
         try:
-            state["base-dir"] = str(self.base_dir.relative_to(Path.cwd()))
+            state["base-dir"] = str(self.base_dir.relative_to(cwd))
         except ValueError as err:
             raise SerializationError from err
         return state
 
     @classmethod
-    def from_serialized(cls: type[_ClsT], state: SerializedType) -> _ClsT:
+    def from_serialized(
+        cls: type[_ClsT],
+        state: SerializedType,
+        *,
+        strict: bool = False,
+        cwd: Optional[Path] = None,
+    ) -> _ClsT:
         """Load a test object from serialized representation.
 
         Note that the cwd is used, as the base directory is assumed to be relative to
-        the cwd.
+        the cwd; callers loading many tests may pass it in. The state is checked
+        directly unless `strict` is set, in which case it is validated against the
+        object schema.
         """
-        try:
-            parsed = cls.get_object_schema().validate(state)
-        except schema.SchemaError as exe:
-            raise SerializationError("Malformed test definition") from exe
+        if strict:
+            try:
+                parsed = cls.get_object_schema().validate(state)
+            except schema.SchemaError as exe:
+                raise SerializationError("Malformed test definition") from exe
+        elif _is_test_state(state):
+            parsed = state
+        else:
+            raise SerializationError("Malformed test definition")
 
         cli_args = parsed["args"]
-        if isinstance(cli_args, str):
-            cli_args = cli_args.split()
+        cli_args = tuple(cli_args.split() if isinstance(cli_args, str) else cli_args)
 
-        query_sets = tuple(resolve_query_set(name) for name in parsed["queries"])
+        # Registered query set names are interned, so lookups hit on identity
+        query_sets = tuple(
+            resolve_query_set(sys.intern(name)) for name in parsed["queries"]
+        )
 
+        if cwd is None:
+            cwd = Path.cwd()
         if "base-dir" in parsed:
-            base_dir = Path.cwd().joinpath(parsed["base-dir"])
+            base_dir = cwd.joinpath(parsed["base-dir"])
         else:
-            base_dir = Path.cwd()
-        if not base_dir.is_relative_to(Path.cwd()):
+            base_dir = cwd
+        if not base_dir.is_relative_to(cwd):
             raise SerializationError("Tests may only search sub-directories.")
         base_dir = base_dir.resolve()
 
-        if isinstance(parsed["input"], Sequence):
+        if isinstance(parsed["input"], list):
             input_files = {f_name: f_name for f_name in parsed["input"]}
         else:
             input_files = parsed["input"]
 
         return cls(
-            name=parsed["test-name"],
+            name=sys.intern(parsed["test-name"]),
             query_sets=query_sets,
             input_files=input_files,
             cli_args=cli_args,
@@ -172,20 +251,26 @@ class TestSuite:
     tests: Mapping[str, TestCase]
 
 
+@lru_cache(maxsize=None)
+def _suite_file_schema() -> SchemaType:
+    """Return the schema for a test suite file, built on first use."""
+    return schema.Schema(
+        {"suite-name": str, "tests": [TestCase.get_object_schema(strict=False)]}
+    )
+
+
 def load_suite_file(file_contents: Any) -> TestSuite:
     """Load test suite definitions from serialized form.
 
     Note that test definitions can make use of the CWD to resolve relative paths.
     """
-    file_schema = schema.Schema(
-        {"suite-name": str, "tests": [TestCase.get_object_schema(strict=False)]}
-    )
     try:
-        parsed = file_schema.validate(file_contents)
+        parsed = _suite_file_schema().validate(file_contents)
     except schema.SchemaError as exe:
         raise SerializationError("Malformed test file") from exe
 
-    tests = [TestCase.from_serialized(_test_rep) for _test_rep in parsed["tests"]]
+    cwd = Path.cwd()
+    tests = [TestCase.from_serialized(_rep, cwd=cwd) for _rep in parsed["tests"]]
     return TestSuite(parsed["suite-name"], {test.name: test for test in tests})
 
 
@@ -204,6 +289,14 @@ class TestSuiteResults:
     results: Mapping[str, Sequence[QuerySetResults]]
 
 
+@lru_cache(maxsize=None)
+def _result_file_schema() -> SchemaType:
+    """Return the schema for a result file, built on first use."""
+    return schema.Schema(
+        {"suite-name": str, "version": str, "suite-results": {str: list}}
+    )
+
+
 def load_result_file(file_contents: Any) -> TestSuiteResults:
     """Load test suite results from a serialized format.
 
@@ -219,11 +312,8 @@ def load_result_file(file_contents: Any) -> TestSuiteResults:
           <test name>: ...
           ...
     """
-    file_schema = schema.Schema(
-        {"suite-name": str, "version": str, "suite-results": {str: list}}
-    )
     try:
-        parsed = file_schema.validate(file_contents)
+        parsed = _result_file_schema().validate(file_contents)
     except schema.SchemaError as exe:
         raise SerializationError("Malformed result file") from exe
 
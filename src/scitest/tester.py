@@ -1,8 +1,10 @@
 """Main entry points to run the test code."""
 
 import sys
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Sequence, TextIO
+from typing import Optional, Sequence, TextIO
 
 from scitest.config import TestConfig
 from scitest.fixture import ExeTestFixture
@@ -13,9 +15,9 @@ from scitest.io import (
     load_test_files,
     write_reference_data,
 )
-from scitest.print_util import OutputTable, wrap_line
+from scitest.print_util import OutputTable, buffered_output, wrap_line
 from scitest.query import QueryResult, QuerySetResults
-from scitest.suite import TestSuite, TestSuiteResults
+from scitest.suite import TestCase, TestSuite, TestSuiteResults
 
 
 def display_query_comparison(test, ref, out_stream=sys.stdout):
@@ -51,38 +53,38 @@ def display_test_comparison(test, ref, tst_label="Test", out_stream=sys.stdout):
     if test.query_set != ref.query_set:
         raise ValueError("Incompatible results sets.")
 
-    fields = (
-        ("Query", 16),
-        ("Pass?", 6),
-        (tst_label, _RESULT_WIDTH),
-        ("Ref.", _RESULT_WIDTH),
-        ("Result", 28),
-    )
-    table_writer = OutputTable(fields, out_stream=out_stream)
-    table_writer.write_header()
-    test_fails = 0
-
-    for query_name in test:
-        test_result = test[query_name]
-        ref_result = ref[query_name]
-        is_pass = ref_result == test_result
-        if not is_pass:
-            test_fails += 1
-
-        line = (
-            query_name,
-            "PASS" if is_pass else "FAIL",
-            test_result.str_short(max_width=_RESULT_WIDTH),
-            ref_result.str_short(max_width=_RESULT_WIDTH),
-            ref_result.compare_msg(test_result),
+    with buffered_output(out_stream) as buffer:
+        fields = (
+            ("Query", 16),
+            ("Pass?", 6),
+            (tst_label, _RESULT_WIDTH),
+            ("Ref.", _RESULT_WIDTH),
+            ("Result", 28),
         )
-        table_writer.write_row(line)
+        table_writer = OutputTable(fields, out_stream=buffer)
+        table_writer.write_header()
+        test_fails = 0
+
+        for query_name, test_result in test.items():
+            ref_result = ref[query_name]
+            is_pass = ref_result == test_result
+            if not is_pass:
+                test_fails += 1
+
+            line = (
+                query_name,
+                "PASS" if is_pass else "FAIL",
+                test_result.str_short(max_width=_RESULT_WIDTH),
+                ref_result.str_short(max_width=_RESULT_WIDTH),
+                ref_result.compare_msg(test_result),
+            )
+            table_writer.write_row(line)
 
-    table_writer.write_footer()
-    if test_fails == 0:
-        out_stream.write("All queries passed!\n")
-    else:
-        out_stream.write("{} of {} queries failed\n".format(test_fails, len(ref)))
+        table_writer.write_footer()
+        if test_fails == 0:
+            buffer.write("All queries passed!\n")
+        else:
+            buffer.write("{} of {} queries failed\n".format(test_fails, len(ref)))
 
 
 # Todo: name fields are redundant
@@ -95,85 +97,81 @@ def display_suite_comparison(
     out_stream=sys.stdout,
 ):
     # type: (str, TestSuiteResults, TestSuiteResults, str, bool, TextIO) -> None
+    with buffered_output(out_stream) as buffer:
+        # Write suite header
+        header_str = "Running test suite: {}".format(suite_name)
+        buffer.write(header_str + "\n")
+        buffer.write("-" * len(header_str) + "\n\n")
 
-    def _search_results(
-        q_set_name: str, possible_results: Sequence[QuerySetResults]
-    ) -> QuerySetResults:
-        """Search for results set matching the name."""
-        for q_set_res in possible_results:
-            if q_set_name == str(q_set_res.query_set):
-                return q_set_res
-        raise RuntimeError(f"Could not find {q_set_name}")
-
-    # Write suite header
-    header_str = "Running test suite: {}".format(suite_name)
-    out_stream.write(header_str + "\n")
-    out_stream.write("-" * len(header_str) + "\n\n")
-
-    # Set up the table writer
-    if not verbose:
-        fields = (("Test", 18), ("Pass?", 6), ("Queries", 24))
-        table_writer = OutputTable(fields, out_stream=out_stream)
-        table_writer.write_header()
-
-    if tst_results.results.keys() != ref_results.results.keys():
-        raise RuntimeError("Test and ref results ran different tests")
-
-    # Check results of each test
-    failed_tests = 0
-    for test_name in ref_results.results:
-        if (
-            len(ref_results.results[test_name]) < 1
-            or len(tst_results.results[test_name]) < 1
-        ):
-            raise RuntimeError(f"No queries were run in {test_name}")
-
-        # Do comparison
-        n_queries = 0
-        n_failures = 0  # Number of failed queries in this test
-        for ref_query_res in ref_results.results[test_name]:
-            tst_query_res = _search_results(
-                str(ref_query_res.query_set), tst_results.results[test_name]
-            )
-            n_queries += len(ref_query_res)
-            n_failures += ref_query_res.count_failures(tst_query_res)
-
-            if verbose:
-                out_stream.write(
-                    f"Test: {test_name}, Query set: {ref_query_res.query_set!s}\n"
+        # Set up the table writer
+        if not verbose:
+            fields = (("Test", 18), ("Pass?", 6), ("Queries", 24))
+            table_writer = OutputTable(fields, out_stream=buffer)
+            table_writer.write_header()
+
+        if tst_results.results.keys() != ref_results.results.keys():
+            raise RuntimeError("Test and ref results ran different tests")
+
+        # Check results of each test
+        failed_tests = 0
+        for test_name in ref_results.results:
+            if (
+                len(ref_results.results[test_name]) < 1
+                or len(tst_results.results[test_name]) < 1
+            ):
+                raise RuntimeError(f"No queries were run in {test_name}")
+
+            # Index test results by query set name
+            tst_by_query_set = {
+                q_set_res.query_set_name: q_set_res
+                for q_set_res in tst_results.results[test_name]
+            }
+
+            # Do comparison
+            n_queries = 0
+            n_failures = 0  # Number of failed queries in this test
+            for ref_query_res in ref_results.results[test_name]:
+                q_set_name = ref_query_res.query_set_name
+                tst_query_res = tst_by_query_set.get(q_set_name)
+                if tst_query_res is None:
+                    raise RuntimeError(f"Could not find {q_set_name}")
+                n_queries += len(ref_query_res)
+                n_failures += ref_query_res.count_failures(tst_query_res)
+
+                if verbose:
+                    buffer.write(f"Test: {test_name}, Query set: {q_set_name}\n")
+                    display_test_comparison(
+                        tst_query_res,
+                        ref_query_res,
+                        tst_label=tst_label,
+                        out_stream=buffer,
+                    )
+
+            n_success = n_queries - n_failures
+            if n_failures > 0:
+                failed_tests += 1
+
+            # Print output
+            if not verbose:
+                table_line = (
+                    test_name,
+                    "PASS" if n_failures == 0 else "FAIL",
+                    f"{n_success} of {n_queries} queries passed",
                 )
-                display_test_comparison(
-                    tst_query_res,
-                    ref_query_res,
-                    tst_label=tst_label,
-                    out_stream=out_stream,
+                table_writer.write_row(table_line)
+            else:
+                buffer.write(
+                    f"Test {test_name}: {n_success}/{n_queries} queries passed\n\n"
                 )
 
-        n_success = n_queries - n_failures
-        if n_failures > 0:
-            failed_tests += 1
-
-        # Print output
         if not verbose:
-            table_line = (
-                test_name,
-                "PASS" if n_failures == 0 else "FAIL",
-                f"{n_success} of {n_queries} queries passed",
-            )
-            table_writer.write_row(table_line)
-        else:
-            out_stream.write(
-                f"Test {test_name}: {n_success}/{n_queries} queries passed\n\n"
-            )
+            table_writer.write_footer()
 
-    if not verbose:
-        table_writer.write_footer()
-
-    # Write final suite summary
-    if failed_tests > 0:
-        out_stream.write(f"{failed_tests}/{len(ref_results.results)} tests failed")
-    else:
-        out_stream.write("All tests passed!\n\n")
+        # Write final suite summary
+        if failed_tests > 0:
+            buffer.write(f"{failed_tests}/{len(ref_results.results)} tests failed")
+        else:
+            buffer.write("All tests passed!\n\n")
 
 
 def display_test_result(
@@ -182,20 +180,20 @@ def display_test_result(
     out_stream: TextIO = sys.stdout,
 ) -> None:
     """Display verbose output for the results of one test."""
-    for q_set_res in test_results:
-        out_stream.write(f"Test: {test_name}, Query set: {q_set_res.query_set!s}\n")
+    with buffered_output(out_stream) as buffer:
+        for q_set_res in test_results:
+            buffer.write(f"Test: {test_name}, Query set: {q_set_res.query_set_name}\n")
 
-        fields = (("Query", 16), ("Result", 32))
-        table_writer = OutputTable(fields, out_stream=out_stream)
-        table_writer.write_header()
+            fields = (("Query", 16), ("Result", 32))
+            table_writer = OutputTable(fields, out_stream=buffer)
+            table_writer.write_header()
 
-        for query_name in q_set_res:
-            query_result = q_set_res[query_name]
-            line = (query_name, str(query_result))
-            table_writer.write_row(line)
+            for query_name, query_result in q_set_res.items():
+                line = (query_name, str(query_result))
+                table_writer.write_row(line)
 
-        table_writer.write_footer()
-        out_stream.write("\n")
+            table_writer.write_footer()
+            buffer.write("\n")
 
 
 def display_suite_result(
@@ -203,44 +201,48 @@ def display_suite_result(
 ):
     # type: (str, TestSuiteResults, bool, TextIO) -> None
 
-    # Write suite header
-    header_str = "Running test suite: {}".format(suite_name)
-    out_stream.write(header_str + "\n")
-    out_stream.write("-" * len(header_str) + "\n\n")
+    with buffered_output(out_stream) as buffer:
+        # Write suite header
+        header_str = "Running test suite: {}".format(suite_name)
+        buffer.write(header_str + "\n")
+        buffer.write("-" * len(header_str) + "\n\n")
 
-    # Set up the table writer
-    if not verbose:
-        fields = (("Test", 18), ("Queries", 24))
-        table_writer = OutputTable(fields, out_stream=out_stream)
-        table_writer.write_header()
-
-    for test_name, test_results in suite_results.results.items():
-        if not test_results:
-            raise RuntimeError(f"No queries run for {test_name}")
+        # Set up the table writer
+        if not verbose:
+            fields = (("Test", 18), ("Queries", 24))
+            table_writer = OutputTable(fields, out_stream=buffer)
+            table_writer.write_header()
 
-        if verbose:
-            display_test_result(test_name, test_results, out_stream=out_stream)
-        else:
-            num_queries = sum(len(res) for res in test_results)
-            table_line = (test_name, f"Ran {num_queries} queries")
-            table_writer.write_row(table_line)
+        for test_name, test_results in suite_results.results.items():
+            if not test_results:
+                raise RuntimeError(f"No queries run for {test_name}")
 
-    if not verbose:
-        table_writer.write_footer()
+            if verbose:
+                display_test_result(test_name, test_results, out_stream=buffer)
+            else:
+                num_queries = sum(len(res) for res in test_results)
+                table_line = (test_name, f"Ran {num_queries} queries")
+                table_writer.write_row(table_line)
 
-    out_stream.write(f"Ran {len(suite_results.results)} tests\n\n")
+        if not verbose:
+            table_writer.write_footer()
 
+        buffer.write(f"Ran {len(suite_results.results)} tests\n\n")
 
-def _run_test_suite(suite, version, exe_path):
-    # type: (TestSuite, str, Path) -> TestSuiteResults
-    import tempfile
 
-    # Create temporary scratch dir
-    # TODO: option for persistent scratch
-    with tempfile.TemporaryDirectory() as scratch_dir:
+def _run_test_suite(
+    suite: TestSuite,
+    version: str,
+    exe_path: Path,
+    parallelism: Optional[int] = None,
+) -> TestSuiteResults:
+    # TODO: option for temporary scratch
+    work_dir = Path.cwd().joinpath("work")
+    if parallelism is not None and parallelism > 1:
+        suite_results = _run_tests_parallel(suite, exe_path, work_dir, parallelism)
+    else:
         # Set up common test fixture
-        scratch_dir = Path.cwd().joinpath("work")
-        fixture = ExeTestFixture(exe_path, scratch_dir)
+        fixture = ExeTestFixture(exe_path, work_dir)
 
         # Run the test suite
         suite_results = {}
@@ -250,11 +252,47 @@ def _run_test_suite(suite, version, exe_path):
     return TestSuiteResults(suite.suite_name, version, suite_results)
 
 
+def _run_tests_parallel(
+    suite: TestSuite, exe_path: Path, scratch_base: Path, max_workers: int
+) -> dict[str, list[QuerySetResults]]:
+    """Run the tests in a suite concurrently, each in its own scratch directory."""
+
+    def _run_one(test: TestCase) -> list[QuerySetResults]:
+        # Suite and test names come from the test files, so they are not used as paths
+        scratch_dir = tempfile.mkdtemp(dir=scratch_base)
+        return test.run_test(ExeTestFixture(exe_path, scratch_dir))
+
+    scratch_base.mkdir(exist_ok=True)
+    try:
+        # Tests spend their time waiting on the exe, so threads suffice
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                test_name: pool.submit(_run_one, test)
+                for test_name, test in suite.tests.items()
+            }
+        return {test_name: fut.result() for test_name, fut in futures.items()}
+    finally:
+        # Each fixture removes its own directory; keep the base if anything is left
+        try:
+            scratch_base.rmdir()
+        except OSError:
+            pass
+
+
+def _wait_for_write(write: Optional[Future[None]]) -> None:
+    """Block until a background write is done, raising any error from it."""
+    if write is not None:
+        write.result()
+
+
 def run_bench_mode(conf: TestConfig, verbose: bool = False) -> None:
     from scitest.version import DateVersion
 
     if conf.exe_path is None:
         raise ValueError
+    bench_out = conf.bench_out
+    if bench_out is None:
+        raise ValueError
 
     out_ver = conf.out_ver
     if out_ver is None:
@@ -266,20 +304,34 @@ def run_bench_mode(conf: TestConfig, verbose: bool = False) -> None:
     # Load test suites
     suites = load_test_files(conf.test_dirs, requested_suites=conf.test_suites)
 
-    # Run test suites and print results
-    all_results = []
-    for suite_name, suite_tests in suites.items():
-        suite_results = _run_test_suite(suite_tests, out_ver, conf.exe_path)
-        display_suite_result(suite_name, suite_results, verbose=verbose)
-        all_results.append(suite_results)
-
-    # Print output
-    write_reference_data(all_results, conf.bench_out)
+    # Run test suites and print results. Output for each suite is written in the
+    # background while the next suite runs.
+    write: Optional[Future[None]] = None
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        try:
+            for suite_name, suite_tests in suites.items():
+                suite_results = _run_test_suite(
+                    suite_tests, out_ver, conf.exe_path, conf.parallelism
+                )
+                # Only one write is in flight; stop here if the previous one failed
+                previous, write = write, None
+                _wait_for_write(previous)
+                write = writer.submit(write_reference_data, [suite_results], bench_out)
+                display_suite_result(suite_name, suite_results, verbose=verbose)
+        except BaseException:
+            # A failed write is still reported if the run itself fails
+            _wait_for_write(write)
+            raise
+    _wait_for_write(write)
 
 
 def run_test_mode(conf: TestConfig, verbose: bool = False) -> None:
     from scitest.version import DateVersion, get_latest_version
 
+    test_out = conf.test_out
+    if test_out is None:
+        raise ValueError
+
     # Load query sets
     load_queries(conf.query_dirs)
 
@@ -304,37 +356,53 @@ def run_test_mode(conf: TestConfig, verbose: bool = False) -> None:
     if ref_data.keys() != suites.keys():
         raise RuntimeError("All tests are not present in reference data.")
 
-    all_results = []
-    for suite_name, suite_tests in suites.items():
-        ref_results = ref_data[suite_name]
-        # Run test suite
-        suite_results = _run_test_suite(suite_tests, out_ver, conf.exe_path)
-        all_results.append(suite_results)
-        # Write comparison
-        display_suite_comparison(
-            suite_name, ref_results, suite_results, verbose=verbose
-        )
-
-    # Write test results
-    write_reference_data(all_results, conf.test_out, test_output=True)
+    write: Optional[Future[None]] = None
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        try:
+            for suite_name, suite_tests in suites.items():
+                ref_results = ref_data[suite_name]
+                # Run test suite
+                suite_results = _run_test_suite(
+                    suite_tests, out_ver, conf.exe_path, conf.parallelism
+                )
+                # Write test results in the background while the next suite runs,
+                # once the previous write has succeeded
+                previous, write = write, None
+                _wait_for_write(previous)
+                write = writer.submit(
+                    write_reference_data, [suite_results], test_out, test_output=True
+                )
+                # Write comparison
+                display_suite_comparison(
+                    suite_name, ref_results, suite_results, verbose=verbose
+                )
+        except BaseException:
+            # A failed write is still reported if the run itself fails
+            _wait_for_write(write)
+            raise
+    _wait_for_write(write)
 
 
 def run_compare_mode(conf: TestConfig, verbose: bool = False) -> None:
-    from scitest.io import load_result_data
+    from scitest.io import load_result_data, select_result_data
 
     # Todo: also both ref and cmp version must be named like ref data. this is surprising
     # TODO: compare mode is likely broken because default queries are never loaded into the resolver
-    # Load results for both benchmarks
-    ref_data = load_result_data(conf.ref_dirs, conf.ref_ver, suites=conf.test_suites)
-    cmp_data = load_result_data(conf.ref_dirs, conf.cmp_ver, suites=conf.test_suites)
-
-    # Check presence of test suites if not specified by user
-    if conf.test_suites is None:
-        if ref_data.keys() != cmp_data.keys():
+    # Check presence of test suites if not specified by user. This only looks at file
+    # names, so results present for just one version are never deserialized.
+    suites = conf.test_suites
+    if suites is None:
+        ref_suites = select_result_data(conf.ref_dirs, conf.ref_ver).keys()
+        cmp_suites = select_result_data(conf.ref_dirs, conf.cmp_ver).keys()
+        if ref_suites and cmp_suites:
             # Do not error, just restrict both to the intersection
-            suites = set(ref_data) & set(cmp_data)
-            ref_data = {k: ref_data[k] for k in suites}
-            cmp_data = {k: cmp_data[k] for k in suites}
+            suites = ref_suites & cmp_suites
+            if not suites:
+                return
+
+    # Load results for both benchmarks
+    ref_data = load_result_data(conf.ref_dirs, conf.ref_ver, suites=suites)
+    cmp_data = load_result_data(conf.ref_dirs, conf.cmp_ver, suites=suites)
 
     # Print comparisons
     for suite in ref_data:
@@ -1,8 +1,10 @@
 """Parsing and sorting for benchmark version stamps."""
 
 import re
-from functools import total_ordering
-from typing import Dict, Iterable, List, Type, TypeVar, Union
+from datetime import date
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Optional, Tuple, Type, TypeVar, Union
 
 
 class VersionError(ValueError):
@@ -12,86 +14,112 @@ class VersionError(ValueError):
 _T = TypeVar("_T", bound="Version")
 
 
-# Global registry mapping stamp prefixes to version classes
+# Global registry mapping (single character) stamp prefixes to version classes
 _version_formats: Dict[str, Type["Version"]] = {}
 
 
-def register_version_fmt(cls):
-    # type: (Type[Version]) -> Type[Version]
+def register_version_fmt(cls: Type["Version"]) -> Type["Version"]:
     """Register a version format class in a global registry.
 
     Raises:
-        ValueError: If the version format uses the same stamp prefix as one already registered
+        ValueError: If the stamp prefix is not a single character, or the version format
+            uses the same stamp prefix or priority as one already registered
     """
+    if len(cls.stamp_prefix) != 1:
+        raise ValueError("Version prefix must be a single character")
     if cls.stamp_prefix in _version_formats:
         raise ValueError("Version prefix '{}' already in use".format(cls.stamp_prefix))
+    # Versions are only compared within a class when their priorities match
+    if any(fmt.priority == cls.priority for fmt in _version_formats.values()):
+        raise ValueError("Version priority {} already in use".format(cls.priority))
     _version_formats[cls.stamp_prefix] = cls
     return cls
 
 
-def version_from_stamp(stamp):
-    # type: (str) -> Version
-    """Try to parse a version string using registered version formats."""
-    for prefix, ver_cls in _version_formats.items():
-        if stamp.startswith(prefix):
-            return ver_cls.from_stamp(stamp)
+@lru_cache(maxsize=4096)
+def version_from_stamp(stamp: str) -> "Version":
+    """Try to parse a version string using registered version formats.
+
+    Parsed versions are cached, so repeated stamps return the same object; it should
+    not be modified.
+    """
+    ver_cls = _version_formats.get(stamp[:1])
+    if ver_cls is not None:
+        return ver_cls.from_stamp(stamp)
     raise VersionError("Stamp '{}' matched no known version formats".format(stamp))
 
 
-@total_ordering
 class Version:
     """Parses and orders different benchmark/test version strings."""
 
+    __slots__ = ("components", "_stamp")
+
     priority: int = -1
     stamp_prefix = ""
 
-    def __init__(self, *args):
-        # type: (*Union[str, int, None]) -> None
+    def __init__(self, *args: Union[str, int, None]) -> None:
         self.components = tuple(args)
+        self._stamp: Optional[str] = None
 
     @property
-    def stamp(self):
-        # type: () -> str
+    def stamp(self) -> str:
+        if self._stamp is None:
+            self._stamp = self._format_stamp()
+        return self._stamp
+
+    def _format_stamp(self) -> str:
         raise NotImplementedError
 
     @classmethod
-    def from_stamp(cls, stamp):
-        # type: (Type[_T], str) -> _T
+    def from_stamp(cls: Type[_T], stamp: str) -> _T:
         raise NotImplementedError
 
-    def __eq__(self, other):
-        # type: (object) -> bool
-        if not isinstance(other, Version):
-            return NotImplemented
+    @property
+    def _sort_key(self) -> Tuple[Any, ...]:
+        """Tuple that sorts like the version, led by the class priority."""
+        raise NotImplementedError
+
+    def _cmp(self, other: "Version") -> int:
+        """Return a negative, zero or positive number as `self` is <, == or > other."""
+        # Instances of different subclasses are sorted by class priority. Registered
+        # formats have unique priorities, so equal priorities mean the same class.
         if self.priority == other.priority:
-            return self._cls_eq(other)
+            return self._cls_cmp(other)
         else:
-            return False
+            return self.priority - other.priority
+
+    def _cls_cmp(self: _T, other: _T) -> int:
+        raise NotImplementedError
 
-    def __lt__(self, other):
-        # type: (Version) -> bool
+    def __eq__(self, other: object) -> bool:
         if not isinstance(other, Version):
             return NotImplemented
-        # Instances of different subclasses are sorted by class priority
-        if self.priority == other.priority:
-            return self._cls_lt(other)
-        else:
-            return self.priority < other.priority
+        return self._cmp(other) == 0
 
-    def _cls_eq(self, other):
-        # type: (_T, _T) -> bool
-        return self.components == other.components
+    def __lt__(self, other: "Version") -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self._cmp(other) < 0
 
-    def _cls_lt(self, other):
-        # type: (_T, _T) -> bool
-        raise NotImplementedError
+    def __le__(self, other: "Version") -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self._cmp(other) <= 0
 
-    def __str__(self):
-        # type: () -> str
+    def __gt__(self, other: "Version") -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self._cmp(other) > 0
+
+    def __ge__(self, other: "Version") -> bool:
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self._cmp(other) >= 0
+
+    def __str__(self) -> str:
         return self.stamp
 
-    def __repr__(self):
-        # type: () -> str
+    def __repr__(self) -> str:
         arg_str = ", ".join(map(repr, self.components))
         return "{cls}({args})".format(cls=self.__class__.__name__, args=arg_str)
 
@@ -100,12 +128,12 @@ class Version:
 class DateVersion(Version):
     """Version interpreted as a date."""
 
+    __slots__ = ("year", "month", "day")
+
     priority = 5
     stamp_prefix = "d"
-    _date_ver_re = re.compile(r"^(\d{4})-(\d{2})-(\d{2})$")
 
-    def __init__(self, *args):
-        # type: (*Union[str, int]) -> None
+    def __init__(self, *args: Union[str, int]) -> None:
         if len(args) != 3:
             raise ValueError
         year, month, day = args
@@ -114,146 +142,154 @@ class DateVersion(Version):
         self.day = int(day)
         super().__init__(year, month, day)
 
-    @property
-    def stamp(self):
-        # type: () -> str
-        return "d{:04d}-{:02d}-{:02d}".format(self.year, self.month, self.day)
+    def _format_stamp(self) -> str:
+        return f"d{self.year:04d}-{self.month:02d}-{self.day:02d}"
 
     @classmethod
-    def from_stamp(cls, stamp):
-        # type: (str) -> DateVersion
-        if not stamp.startswith(cls.stamp_prefix):
+    def from_stamp(cls, stamp: str) -> "DateVersion":
+        if not stamp or stamp[0] != cls.stamp_prefix:
             raise VersionError("Malformed stamp " + stamp)
-        match = cls._date_ver_re.match(stamp[1:])
-        if not match:
-            raise VersionError("Bad date " + stamp[1:])
-        return cls(*map(int, match.groups()))
+        # Fixed width YYYY-MM-DD; slicing is much cheaper than a regex match
+        date_str = stamp[1:]
+        year, month, day = date_str[:4], date_str[5:7], date_str[8:]
+        if not (
+            len(date_str) == 10
+            and date_str[4] == date_str[7] == "-"
+            and (year + month + day).isdecimal()
+        ):
+            raise VersionError("Bad date " + date_str)
+        return cls(int(year), int(month), int(day))
 
-    @classmethod
-    def today(cls):
-        # type: () -> DateVersion
-        from datetime import date
+    @property
+    def _sort_key(self) -> Tuple[int, int, int, int]:
+        return (self.priority, self.year, self.month, self.day)
 
+    @classmethod
+    def today(cls) -> "DateVersion":
         today = date.today()
         return cls(today.year, today.month, today.day)
 
-    def _cls_lt(self, other):
-        # type: (DateVersion) -> bool
-        if not isinstance(other, self.__class__):
-            raise TypeError
-        return self.components < other.components
+    def _cls_cmp(self, other: "DateVersion") -> int:
+        return (self.components > other.components) - (
+            self.components < other.components
+        )
+
+
+@lru_cache(maxsize=1024)
+def _version_core(major: int, minor: int, patch: int) -> Tuple[int, int, int]:
+    """Return a shared tuple for the version core, as many versions have equal cores."""
+    return (major, minor, patch)
 
 
 @register_version_fmt
 class SemVersion(Version):
     """Version interpreted according to the semantic version spec."""
 
+    __slots__ = ("version_core", "pre_release", "build_meta")
+
     priority = 10
     stamp_prefix = "v"
     _sem_ver_re = re.compile(
-        r"^(?P<major>0|[1-9]\d*)\.(?P<minor>0|[1-9]\d*)\.(?P<patch>0|[1-9]\d*)"
+        r"(?P<major>0|[1-9]\d*)\.(?P<minor>0|[1-9]\d*)\.(?P<patch>0|[1-9]\d*)"
         r"(?:-(?P<prerelease>(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)"
         r"(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?"
-        r"(?:\+(?P<buildmetadata>[0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$"
+        r"(?:\+(?P<buildmetadata>[0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?"
     )
-    _pr_numeric_re = re.compile(r"^(?:0|[1-9]\d*)$")
 
-    def __init__(self, *args):
-        # type: (*Union[str, int, None]) -> None
+    def __init__(self, *args: Union[str, int, None]) -> None:
         if len(args) != 5:
             raise ValueError
         major, minor, patch, pre_rel, build = args
         if major is None or minor is None or patch is None:
             raise ValueError
-        self.version_core = (int(major), int(minor), int(patch))
+        self.version_core = _version_core(int(major), int(minor), int(patch))
         self.pre_release = str(pre_rel) if pre_rel is not None else None
         self.build_meta = str(build) if build is not None else None
         super().__init__(*args)
 
-    @property
-    def stamp(self):
-        # type: () -> str
-        version_string = "v{!s}.{!s}.{!s}".format(*self.version_core)
+    def _format_stamp(self) -> str:
+        major, minor, patch = self.version_core
+        version_string = f"v{major}.{minor}.{patch}"
         if self.pre_release is not None:
-            version_string += "-{}".format(self.pre_release)
+            version_string += f"-{self.pre_release}"
         if self.build_meta is not None:
-            version_string += "+{}".format(self.build_meta)
+            version_string += f"+{self.build_meta}"
         return version_string
 
+    @property
+    def _sort_key(self) -> Tuple[Any, ...]:
+        if self.pre_release is None:
+            # Normal versions have precedence over pre-release versions
+            return (self.priority, self.version_core, (1,))
+        # Numeric fields sort before, and are never compared to, alphanumeric fields
+        pr_key = tuple(
+            (0, int(field)) if self._is_numeric_identifier(field) else (1, field)
+            for field in self.pre_release.split(".")
+        )
+        return (self.priority, self.version_core, (0, pr_key))
+
     @classmethod
-    def from_stamp(cls, stamp):
-        # type: (str) -> SemVersion
-        if not stamp.startswith(cls.stamp_prefix):
+    def from_stamp(cls, stamp: str) -> "SemVersion":
+        if not stamp or stamp[0] != cls.stamp_prefix:
             raise VersionError("Malformed stamp {}".format(stamp))
-        match = cls._sem_ver_re.match(stamp[1:])
+        match = cls._sem_ver_re.fullmatch(stamp[1:])
         if not match:
             raise VersionError("Bad semantic version {}".format(stamp[1:]))
-        components: List[Union[str, int, None]] = [
-            int(match.group(k)) for k in ("major", "minor", "patch")
-        ]
-        for k in ("prerelease", "buildmetadata"):
-            try:
-                components.append(match.group(k))
-            except IndexError:
-                components.append("")
-
-        return cls(*components)
-
-    def _cls_eq(self, other):
-        # type: (SemVersion) -> bool
-        if not isinstance(other, self.__class__):
-            raise TypeError
-        # Ignore build metadata in comparison
-        return self.components[:4] == other.components[:4]
-
-    def _cls_lt(self, other):
-        # type: (SemVersion) -> bool
-        if not isinstance(other, self.__class__):
-            raise TypeError
+        # Unmatched optional groups are returned as None
+        major, minor, patch, pre_rel, build = match.group(
+            "major", "minor", "patch", "prerelease", "buildmetadata"
+        )
+        return cls(int(major), int(minor), int(patch), pre_rel, build)
+
+    def _cls_cmp(self, other: "SemVersion") -> int:
         # Compare version core
         if self.version_core != other.version_core:
-            return self.version_core < other.version_core
+            return -1 if self.version_core < other.version_core else 1
         # Compare pre-release
         if self.pre_release == other.pre_release:
             # Pre-release versions equal; build metadata does not factor into comparison
-            return False
+            return 0
         elif self.pre_release is None:
             # Other has a pre-release version; normal versions have precedence over pre-release versions
-            return False
+            return 1
         elif other.pre_release is None:
             # This is a pre-release but other is not
-            return True
+            return -1
+        elif self._compare_pre_release(self.pre_release, other.pre_release):
+            # Distinct pre-release versions are never ordered equal
+            return -1
         else:
-            # Compare pre-release versions
-            return self._compare_pre_release(self.pre_release, other.pre_release)
+            return 1
+
+    @staticmethod
+    def _is_numeric_identifier(ident: str) -> bool:
+        """Check for a pre-release field made of digits with no leading zero."""
+        return ident.isascii() and ident.isdigit() and (ident == "0" or ident[0] != "0")
 
     @classmethod
-    def _compare_pre_release(cls, this_pr, other_pr):
-        # type: (str, str) -> bool
-        this_h, _, this_rest = this_pr.partition(".")
-        other_h, _, other_rest = other_pr.partition(".")
-        if this_h != other_h:
+    def _compare_pre_release(cls, this_pr: str, other_pr: str) -> bool:
+        this_fields = this_pr.split(".")
+        other_fields = other_pr.split(".")
+        for this_f, other_f in zip(this_fields, other_fields):
+            if this_f == other_f:
+                continue
             # Difference found; order based on this component
-            this_num_mat = cls._pr_numeric_re.match(this_h)
-            other_num_mat = cls._pr_numeric_re.match(other_h)
-            if this_num_mat and other_num_mat:
+            this_num = cls._is_numeric_identifier(this_f)
+            other_num = cls._is_numeric_identifier(other_f)
+            if this_num and other_num:
                 # Both fields numeric; compare as ints
-                return int(this_h) < int(other_h)
-            elif this_num_mat or other_num_mat:
+                return int(this_f) < int(other_f)
+            elif this_num or other_num:
                 # Numeric fields have lower precedence
-                return this_num_mat is not None
+                return this_num
             else:
                 # Compare non-numeric fields lexicographically
-                return this_h < other_h
-        elif this_rest == "" or other_rest == "":
-            # More fields is higher precedence; should not both be empty (but if so, order is arbitrary)
-            return this_rest == ""
-        else:
-            # Order using the rest of the version string
-            return cls._compare_pre_release(this_rest, other_rest)
+                return this_f < other_f
+        # Common fields are equal; more fields is higher precedence
+        return len(this_fields) < len(other_fields)
 
 
-def get_latest_version(version_strings):
-    # type: (Iterable[str]) -> str
-    versions = [version_from_stamp(v_str) for v_str in version_strings]
-    return max(versions).stamp
+def get_latest_version(version_strings: Iterable[str]) -> str:
+    # Parse lazily; only the latest version needs to be kept
+    versions = map(version_from_stamp, version_strings)
+    return max(versions, key=attrgetter("_sort_key")).stamp
@@ -0,0 +1,23 @@
+"""Tests for config parsing."""
+
+import pytest
+
+from scitest import cli, config
+
+
+def test_parallelism_converted_from_string() -> None:
+    conf = config.TestConfig.from_mapping({"parallelism": "4"})
+    assert conf.parallelism == 4
+
+
+def test_parallelism_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        config.TestConfig.from_mapping({"parallelism": "0"})
+
+
+def test_jobs_option_sets_parallelism() -> None:
+    args = cli.parse_args(["--jobs", "3"])
+    conf = config.TestConfig.from_namespace(args, cli.PARSER_FIELDS)
+    assert conf.parallelism == 3
+    args = cli.parse_args([])
+    assert config.TestConfig.from_namespace(args, cli.PARSER_FIELDS).parallelism is None
@@ -0,0 +1,137 @@
+"""Tests for quantity formatting and comparison."""
+
+import math
+
+import attrs
+import pytest
+
+from scitest.query.quantity import (
+    BoolQuantity,
+    FloatQuantity,
+    IntegerQuantity,
+    QuantityTypeBase,
+    SequenceQuantity,
+    load_quantity,
+)
+
+_FLOATS = [0.0, 1.0, -1.0, 1.00001, 1e10, 1e10 + 1, math.inf, -math.inf, math.nan]
+
+
+@pytest.mark.parametrize(
+    ("value", "width", "precision", "expected"),
+    [
+        (1.5, 6, None, "1.5000"),
+        (-1.5, 6, 2, "-01.50"),
+        (12345.0, 8, None, "1.2345e4"),
+        (1e-7, 6, None, "1.0e-7"),
+        (1e28, 6, None, "1.0e28"),
+        (1e-24, 8, None, "1.00e-24"),
+        (9.74e18, 4, 0, "1e19"),
+        (9.98e-34, 7, None, "1.0e-33"),
+        (9.99, 2, None, "10"),
+    ],
+)
+def test_as_fixed_width(
+    value: float, width: int, precision: int | None, expected: str
+) -> None:
+    assert FloatQuantity.as_fixed_width(value, width, precision) == expected
+
+
+def _shortest_exp_width(value: float, signed: bool) -> int:
+    """Width of the shortest exponential form of a value, e.g. '-1e10'."""
+    mantissa, exponent = f"{value:.0e}".split("e")
+    return len(mantissa) + 1 + len(str(int(exponent))) + (signed and value >= 0)
+
+
+@pytest.mark.parametrize("exponent", range(-40, 41))
+@pytest.mark.parametrize("width", [4, 7, 12])
+@pytest.mark.parametrize("signed", [False, True])
+def test_as_fixed_width_fills_width(exponent: int, width: int, signed: bool) -> None:
+    for mantissa in (1.0, -1.0, 9.5, 9.999999, -9.97):
+        value = mantissa * 10.0**exponent
+        try:
+            formatted = FloatQuantity.as_fixed_width(value, width, signed=signed)
+        except ValueError:
+            # Only allowed when even the shortest exponential form does not fit
+            if _shortest_exp_width(value, signed) > width:
+                continue
+            raise
+        assert len(formatted) == width, formatted
+
+
+@pytest.mark.parametrize(("value", "signed"), [(-9.99e9, False), (9.99e9, True)])
+def test_as_fixed_width_too_narrow(value: float, signed: bool) -> None:
+    with pytest.raises(ValueError):
+        FloatQuantity.as_fixed_width(value, 4, signed=signed)
+
+
+def test_as_fixed_width_rejects_non_finite() -> None:
+    with pytest.raises(ValueError):
+        FloatQuantity.as_fixed_width(float("inf"), 8)
+
+
+@pytest.mark.parametrize(
+    ("quantity", "values"),
+    [
+        (FloatQuantity(), _FLOATS),
+        (FloatQuantity(1e-3, 1e-6), _FLOATS),
+        (FloatQuantity(math.inf), _FLOATS),
+        (IntegerQuantity(), [0, 1, -1, 100, 101]),
+        (IntegerQuantity(abs_tol=1, rel_tol=0.5), [0, 1, -1, 100, 101]),
+        (BoolQuantity(), [True, False]),
+    ],
+)
+def test_compare_batch_matches_compare(
+    quantity: QuantityTypeBase, values: list
+) -> None:
+    refs = [ref for ref in values for _ in values]
+    tests = [test for _ in values for test in values]
+    expected = [quantity.compare(ref, test) for ref, test in zip(refs, tests)]
+    assert list(quantity.compare_batch(refs, tests)) == expected
+
+
+def test_sequence_compare_uses_wrapped_batch() -> None:
+    quantity = SequenceQuantity(FloatQuantity(0.1))
+    assert quantity.compare([1.0, 2.0], [1.05, 2.0])
+    assert not quantity.compare([1.0, 2.0], [1.0, 2.5])
+    assert not quantity.compare([1.0, 2.0], [1.0])
+    assert quantity.compare_msg([1.0, 2.0], [1.5, 2.5]) == "Errors in 2 elements"
+
+
+def test_str_long_follows_precision() -> None:
+    quantity = FloatQuantity(precision=2)
+    assert quantity.str_long(1.23456) == "1.23"
+    quantity.precision = 4
+    assert quantity.str_long(1.23456) == "1.2346"
+    assert quantity.compare_msg(1.0, 1.5) == "Abs. error 0.5000"
+
+
+def test_subclasses_can_set_attributes_after_init() -> None:
+    @attrs.define(order=False)
+    class LabelledFloat(FloatQuantity):
+        label: str = attrs.field(init=False, default="")
+
+        def __attrs_post_init__(self) -> None:
+            self.label = f"{self.precision} digits"
+
+    @attrs.define(order=False)
+    class LabelledSequence(SequenceQuantity):
+        label: str = attrs.field(init=False, default="")
+
+        def __attrs_post_init__(self) -> None:
+            super().__attrs_post_init__()
+            self.label = "sequence"
+
+    assert LabelledFloat(precision=3).label == "3 digits"
+    sequence = LabelledSequence(FloatQuantity())
+    assert sequence.label == "sequence"
+    assert sequence.str_long([1.0]) == "[1.000000]"
+    assert not hasattr(sequence, "__dict__")
+
+
+def test_load_quantity() -> None:
+    assert load_quantity("FloatQuantity") == FloatQuantity()
+    loaded = load_quantity(
+        {"quantity-type": "IntegerQuantity", "parameters": {"abs_tol": 2}}
+    )
+    assert loaded == IntegerQuantity(abs_tol=2)
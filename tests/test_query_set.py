@@ -0,0 +1,103 @@
+"""Tests for query sets and their results."""
+
+import pytest
+
+from scitest.exceptions import SerializationError
+from scitest.query import (
+    QueryResult,
+    QuerySet,
+    QuerySetResults,
+    load_query,
+    register_queries,
+    register_query_sets,
+)
+
+
+@pytest.fixture(scope="module")
+def query_set() -> QuerySet:
+    queries = [
+        load_query(
+            {
+                "query-name": name,
+                "query-type": "RegexQuery",
+                "quantity": "FloatQuantity",
+                "properties": {"search_regex": rf"{name} (\S+)"},
+            }
+        )
+        for name in ("qset-energy", "qset-force")
+    ]
+    register_queries(queries)
+    return QuerySet("qset-test", queries)
+
+
+def test_results_follow_query_set_order(query_set: QuerySet) -> None:
+    energy, force = query_set
+    results = QuerySetResults(
+        "run", query_set, [QueryResult(force, 2.0), QueryResult(energy, 1.0)]
+    )
+    assert list(results) == ["qset-energy", "qset-force"]
+    assert list(results.results) == ["qset-energy", "qset-force"]
+    assert results.results["qset-force"].result == 2.0
+
+
+def test_results_mapping_is_a_copy(query_set: QuerySet) -> None:
+    results = QuerySetResults(
+        "run", query_set, [QueryResult(query, 1.0) for query in query_set]
+    )
+    results.results.clear()
+    assert len(results) == 2
+
+
+def test_query_set_rejects_unknown_keys(query_set: QuerySet) -> None:
+    state = query_set.serialize()
+    state["extra"] = 1
+    for strict in (False, True):
+        with pytest.raises(SerializationError):
+            QuerySet.from_serialized(state, strict=strict)
+
+
+def test_results_reject_unknown_keys(query_set: QuerySet) -> None:
+    register_query_sets([query_set])
+    results = QuerySetResults(
+        "run", query_set, [QueryResult(query, 1.0) for query in query_set]
+    )
+    state = results.serialize()
+    assert QuerySetResults.from_serialized(state).results == results.results
+    state["extra"] = 1
+    for strict in (False, True):
+        with pytest.raises(SerializationError):
+            QuerySetResults.from_serialized(state, strict=strict)
+
+
+def test_result_rejects_unknown_keys(query_set: QuerySet) -> None:
+    state = QueryResult(next(iter(query_set)), 1.0).serialize()
+    state["extra"] = 1
+    for strict in (False, True):
+        with pytest.raises(SerializationError):
+            QueryResult.from_serialized(state, strict=strict)
+
+
+def test_count_failures_matches_pairwise_compare(query_set: QuerySet) -> None:
+    energy, force = query_set
+    ref = QuerySetResults(
+        "ref", query_set, [QueryResult(energy, 1.0), QueryResult(force, 2.0)]
+    )
+    same = QuerySetResults(
+        "same", query_set, [QueryResult(force, 2.0), QueryResult(energy, 1.00001)]
+    )
+    differ = QuerySetResults(
+        "differ",
+        query_set,
+        [QueryResult(energy, 1.5), QueryResult(force, None, error=True)],
+    )
+    for other in (ref, same, differ):
+        pairwise = sum(ref[name] != other[name] for name in ref)
+        assert ref.count_failures(other) == pairwise
+        assert ref.compare_results(other) == (pairwise == 0)
+    assert ref.count_failures(differ) == 2
+
+
+def test_query_set_name_is_read_only(query_set: QuerySet) -> None:
+    with pytest.raises(AttributeError):
+        query_set.query_set_name = "other"  # type: ignore[misc]
+    assert hash(query_set) == hash(QuerySet("qset-test", list(query_set)))
@@ -0,0 +1,65 @@
+"""Tests for query results."""
+
+import pytest
+
+from scitest.exceptions import SerializationError
+from scitest.query import QueryResult, load_query, register_queries
+from scitest.query.base import OutputQueryBase
+
+
+@pytest.fixture(scope="module")
+def query() -> OutputQueryBase:
+    query = load_query(
+        {
+            "query-name": "results-energy",
+            "query-type": "RegexQuery",
+            "quantity": "FloatQuantity",
+            "properties": {"search_regex": r"energy (\S+)"},
+        }
+    )
+    register_queries([query])
+    return query
+
+
+def test_repr(query: OutputQueryBase) -> None:
+    assert repr(QueryResult(query, 1.5)) == f"QueryResult(query={query!r}, result=1.5)"
+
+
+def test_repr_error(query: OutputQueryBase) -> None:
+    assert (
+        repr(QueryResult(query, None, error=True))
+        == f"QueryResult(query={query!r}, result=ERROR, error=True)"
+    )
+
+
+def test_result_is_read_only(query: OutputQueryBase) -> None:
+    result = QueryResult(query, 1.5)
+    with pytest.raises(AttributeError):
+        result.result = 2.0  # type: ignore[misc]
+
+
+def test_serialize_returns_fresh_state(query: OutputQueryBase) -> None:
+    result = QueryResult(query, 1.5)
+    state = result.serialize()
+    state["result"] = 2.0
+    assert result.serialize() == {"query-name": "results-energy", "result": 1.5}
+
+
+@pytest.mark.parametrize("strict", [False, True])
+def test_from_serialized(query: OutputQueryBase, strict: bool) -> None:
+    loaded = QueryResult.from_serialized(
+        {"query-name": "results-energy", "result": 1.5}, strict=strict
+    )
+    assert loaded.result == 1.5 and not loaded.error
+    errored = QueryResult.from_serialized(
+        {"query-name": "results-energy", "result": "ERROR", "error": True},
+        strict=strict,
+    )
+    assert errored.error
+    for state in (
+        {"query-name": "results-energy"},
+        {"query-name": "results-energy", "result": 1.5, "error": "no"},
+        ["results-energy", 1.5],
+    ):
+        with pytest.raises(SerializationError):
+            QueryResult.from_serialized(state, strict=strict)
@@ -0,0 +1,59 @@
+"""Tests for test case definitions."""
+
+from pathlib import Path
+
+import pytest
+
+from scitest import suite
+from scitest.exceptions import SerializationError
+
+
+def test_input_file_reread_after_change(tmp_path: Path) -> None:
+    in_file = tmp_path / "in.dat"
+    in_file.write_text("first", encoding="utf8")
+    test = suite.TestCase(
+        "case", [], input_files={"in.dat": "in.dat"}, base_dir=tmp_path
+    )
+    assert test.get_input_file("in.dat") == "first"
+    in_file.write_text("second", encoding="utf8")
+    assert test.get_input_file("in.dat") == "second"
+
+
+@pytest.mark.parametrize(
+    "state",
+    [
+        {"test-name": "a", "args": "-v", "input": ["in.dat"], "queries": ["q"]},
+        {"test-name": "a", "args": ["-v"], "input": {"x": "y"}, "queries": []},
+        {
+            "test-name": "a",
+            "prefix": "p",
+            "base-dir": "sub",
+            "args": [],
+            "input": [],
+            "queries": ["q"],
+        },
+        {"test-name": "a", "args": "-v", "input": {}, "queries": ["q"]},
+        {"test-name": "a", "args": "-v", "input": ["in.dat"]},
+        {"test-name": "a", "args": 3, "input": ["in.dat"], "queries": ["q"]},
+        {"test-name": "a", "args": "", "input": {"x": 1}, "queries": ["q"]},
+        {"test-name": "a", "args": "", "input": [], "queries": [], "extra": 1},
+        {"test-name": "a", "prefix": None, "args": "", "input": [], "queries": []},
+        ["test-name"],
+    ],
+)
+def test_direct_check_matches_schema(state: object) -> None:
+    schema_valid = suite.TestCase.get_object_schema().is_valid(state)
+    assert suite._is_test_state(state) == schema_valid
+
+
+@pytest.mark.parametrize("strict", [False, True])
+def test_from_serialized(tmp_path: Path, strict: bool) -> None:
+    state = {"test-name": "a", "args": "-v  -x", "input": ["in.dat"], "queries": []}
+    test = suite.TestCase.from_serialized(state, strict=strict, cwd=tmp_path)
+    assert test.cli_args == ("-v", "-x")
+    assert test.input_files == {"in.dat": "in.dat"}
+    assert test.prefix == "a"
+    with pytest.raises(SerializationError):
+        suite.TestCase.from_serialized(
+            {**state, "input": {}}, strict=strict, cwd=tmp_path
+        )
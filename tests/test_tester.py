@@ -0,0 +1,106 @@
+"""Tests for running test suites."""
+
+import stat
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from scitest import config, suite, tester
+from scitest.query import QuerySet, load_query
+
+
+@pytest.fixture
+def echo_exe(tmp_path: Path) -> Path:
+    """Program under test that echoes its first argument."""
+    exe_path = tmp_path / "echo.sh"
+    exe_path.write_text('#!/bin/sh\necho "value $1"\n', encoding="utf8")
+    exe_path.chmod(exe_path.stat().st_mode | stat.S_IXUSR)
+    return exe_path
+
+
+@pytest.fixture
+def echo_suite() -> suite.TestSuite:
+    query = load_query(
+        {
+            "query-name": "tester-echo-value",
+            "query-type": "RegexQuery",
+            "quantity": "FloatQuantity",
+            "properties": {"search_regex": r"value (\S+)", "file_ext": "stdout"},
+        }
+    )
+    query_set = QuerySet("tester-echo", [query])
+    tests = [
+        suite.TestCase(f"case{idx}", [query_set], cli_args=[str(idx / 4)])
+        for idx in range(8)
+    ]
+    return suite.TestSuite("echo", {test.name: test for test in tests})
+
+
+def test_parallel_run_matches_serial(
+    echo_exe: Path,
+    echo_suite: suite.TestSuite,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    serial = tester._run_test_suite(echo_suite, "v1.0.0", echo_exe)
+    parallel = tester._run_test_suite(echo_suite, "v1.0.0", echo_exe, parallelism=2)
+
+    assert list(parallel.results) == list(serial.results)
+    for test_name, serial_results in serial.results.items():
+        assert [res.serialize() for res in parallel.results[test_name]] == [
+            res.serialize() for res in serial_results
+        ]
+    assert serial.results["case3"][0]["tester-echo-value"].result == 0.75
+    # Scratch directories are all cleaned up
+    assert not tmp_path.joinpath("work").exists()
+
+
+def _bench_run_with_failing_writes(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    ran: list[str],
+    fail_suite: Optional[str] = None,
+) -> None:
+    """Run bench mode over three suites where every write of results fails."""
+    suites = {name: suite.TestSuite(name, {}) for name in ("s1", "s2", "s3")}
+
+    def _run_suite(
+        suite_tests: suite.TestSuite, version: str, *args: object
+    ) -> suite.TestSuiteResults:
+        ran.append(suite_tests.suite_name)
+        if suite_tests.suite_name == fail_suite:
+            raise RuntimeError("run failed")
+        return suite.TestSuiteResults(suite_tests.suite_name, version, {})
+
+    def _write(*args: object, **kwargs: object) -> None:
+        raise OSError("write failed")
+
+    monkeypatch.setattr(tester, "load_queries", lambda dirs: None)
+    monkeypatch.setattr(tester, "load_test_files", lambda dirs, **kwargs: suites)
+    monkeypatch.setattr(tester, "_run_test_suite", _run_suite)
+    monkeypatch.setattr(tester, "write_reference_data", _write)
+    monkeypatch.setattr(tester, "display_suite_result", lambda *args, **kwargs: None)
+    conf = config.TestConfig(exe_path=tmp_path, bench_out=tmp_path, out_ver="v1.0.0")
+    tester.run_bench_mode(conf)
+
+
+def test_failed_write_stops_the_run(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    ran: list[str] = []
+    with pytest.raises(OSError):
+        _bench_run_with_failing_writes(tmp_path, monkeypatch, ran)
+    # The first write fails while the second suite runs; the third never starts
+    assert ran == ["s1", "s2"]
+
+
+def test_failed_write_reported_when_run_fails(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    ran: list[str] = []
+    with pytest.raises(OSError) as exc_info:
+        _bench_run_with_failing_writes(tmp_path, monkeypatch, ran, fail_suite="s2")
+    assert isinstance(exc_info.value.__context__, RuntimeError)
+    assert ran == ["s1", "s2"]
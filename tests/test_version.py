@@ -0,0 +1,44 @@
+"""Tests for version stamps."""
+
+import pytest
+
+from scitest.version import (
+    DateVersion,
+    SemVersion,
+    VersionError,
+    get_latest_version,
+    version_from_stamp,
+)
+
+
+def test_stamp_dispatch() -> None:
+    assert isinstance(version_from_stamp("d2023-01-02"), DateVersion)
+    assert isinstance(version_from_stamp("v1.2.3-rc.1+build"), SemVersion)
+    with pytest.raises(VersionError):
+        version_from_stamp("x1.2.3")
+
+
+@pytest.mark.parametrize("stamp", ["d2023-01-02", "v1.2.3", "v0.1.0-alpha.1+build.5"])
+def test_stamp_round_trip(stamp: str) -> None:
+    assert version_from_stamp(stamp).stamp == stamp
+
+
+def test_semver_order() -> None:
+    stamps = [
+        "v1.0.0-alpha",
+        "v1.0.0-alpha.1",
+        "v1.0.0-alpha.beta",
+        "v1.0.0-beta",
+        "v1.0.0-beta.2",
+        "v1.0.0-beta.11",
+        "v1.0.0-rc.1",
+        "v1.0.0",
+    ]
+    versions = [version_from_stamp(stamp) for stamp in stamps]
+    assert versions == sorted(reversed(versions))
+    assert sorted(versions, key=lambda ver: ver._sort_key) == versions
+
+
+def test_latest_version_prefers_semver() -> None:
+    assert get_latest_version(["d2030-01-01", "v0.1.0", "v0.2.0-rc.1"]) == "v0.2.0-rc.1"
+    assert get_latest_version(["d2020-01-01", "d2021-12-31"]) == "d2021-12-31"